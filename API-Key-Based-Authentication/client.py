@@ -1,12 +1,16 @@
 import asyncio
-import json
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from typing import Optional
-from mcp import ClientSession
-from mcp.client.sse import sse_client
-from openai import OpenAI
 import mcp.client.sse as _sse_mod
 from httpx import AsyncClient as _BaseAsyncClient
 from loguru import logger
+from mcp_common.concurrency import map_bounded
+from mcp_common.decision_cache import DecisionCache
+from mcp_common.llm import AsyncLLMClient
+from mcp_common.manifest import ToolManifest
+from mcp_common.mcp_client import PersistentMCPClient
 
 from dotenv import load_dotenv
 
@@ -21,27 +25,11 @@ async def _patched_request(self, method, url, *args, **kwargs):
     return await _orig_request(self, method, url, *args, **kwargs)
 
 httpx.AsyncClient.request = _patched_request
-def llm_client(message: str):
-    client = OpenAI()
 
-    completion = client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[
-            {"role": "system", "content": "You are an intelligent Assistant. You will execute tasks as instructed"},
-            {
-                "role": "user",
-                "content": message,
-            },
-        ],
-    )
 
-    result = completion.choices[0].message.content
-    return result
-
-
-
-def get_prompt_to_identify_tool_and_arguements(query, tools):
-    tools_description = "\n".join([f"{tool.name}: {tool.description}, {tool.inputSchema}" for tool in tools.tools])
+def get_prompt_to_identify_tool_and_arguements(query, manifest: ToolManifest):
+    # Rendered once per tool list; see mcp_common.manifest
+    tools_description = manifest.description
     return  ("You are a helpful assistant with access to these tools:\n\n"
                 f"{tools_description}\n"
                 "Choose the appropriate tool based on the user's question. \n"
@@ -59,38 +47,63 @@ def get_prompt_to_identify_tool_and_arguements(query, tools):
     
 
 
-async def main(query:str):
-    sse_url = "http://localhost:8100/sse"
+SSE_URL = "http://localhost:8100/sse"
+# Queries in flight at once over the shared session; 1 runs them one by one
+QUERY_CONCURRENCY = int(os.getenv("QUERY_CONCURRENCY", "4"))
+# Tool decisions for repeated queries; set DECISION_CACHE_PATH to keep them between runs
+DECISION_CACHE_SIZE = int(os.getenv("DECISION_CACHE_SIZE", "1000"))
+DECISION_CACHE_TTL = float(os.getenv("DECISION_CACHE_TTL", str(24 * 3600)))
+DECISION_CACHE_PATH = os.getenv("DECISION_CACHE_PATH")
 
-    # 1) Open SSE → yields (in_stream, out_stream)
-    
-    headers = {"x-api-key":"secretkey"}
-    async with sse_client(url=sse_url,headers=headers) as (in_stream, out_stream):
-        # 2) Create an MCP session over those streams
-        async with ClientSession(in_stream, out_stream) as session:
-            # 3) Initialize
-            info = await session.initialize()
-            logger.info(f"Connected to {info.serverInfo.name} v{info.serverInfo.version}")
-
-            # 4) List tools
-            tools = (await session.list_tools())
-            logger.info(tools)            
-            
-            prompt = get_prompt_to_identify_tool_and_arguements(query,tools)
+
+async def main(query:str, client: PersistentMCPClient, llm: AsyncLLMClient, decisions: DecisionCache):
+    try:
+        # Listed once per connection and re-fetched only when the server reports a change
+        manifest = await client.tool_manifest()
+
+        tool_call = decisions.get(query, manifest.hash)
+        if tool_call is not None:
+            logger.info(f"Decision cache hit for {query!r}: {tool_call['tool']} (hit rate {decisions.stats()['hit_rate']:.0%})")
+        else:
+            prompt = get_prompt_to_identify_tool_and_arguements(query,manifest)
             logger.info(f"Printing Prompt \n {prompt}")
-            
-            response = llm_client(prompt)
+
+            # Streamed; returns as soon as the tool-call JSON closes, so the tool call
+            # goes out while the model may still be writing
+            tool_call, response = await llm.tool_call(prompt)
             print(response)
-            
-            tool_call = json.loads(response)
-                        
-            result = await session.call_tool(tool_call["tool"], arguments=tool_call["arguments"])
-            logger.success(f"User query: {query}, Tool Response: {result.content[0].text}")
+            if tool_call is None:
+                # No tool needed; the model answered directly
+                return response
+
+        result = await client.call_tool(tool_call["tool"], arguments=tool_call["arguments"])
+        if not result.isError:
+            # Only decisions that led to a successful tool call are reused
+            decisions.put(query, manifest.hash, tool_call)
+        logger.success(f"User query: {query}, Tool Response: {result.content[0].text}")
+        return result.content[0].text
+    except Exception as e:
+        # One bad query (e.g. an unparsable LLM reply) must not lose the others' results
+        print(f"Encountered error: {e}")
+
+
+async def run_queries(queries, concurrency: int = QUERY_CONCURRENCY):
+    # One SSE connection for all queries, re-established if it drops. Requests
+    # from concurrent queries are multiplexed over it by JSON-RPC request id.
+    headers = {"x-api-key":"secretkey"}
+    decisions = DecisionCache(DECISION_CACHE_SIZE, DECISION_CACHE_TTL, DECISION_CACHE_PATH)
+    # One pooled LLM client for all queries as well
+    async with AsyncLLMClient() as llm, PersistentMCPClient(SSE_URL, headers=headers) as client:
+        try:
+            return await map_bounded(lambda query: main(query, client, llm, decisions), queries, concurrency)
+        finally:
+            decisions.save()
+            logger.info(f"Decision cache: {decisions.stats()}")
 
-            
 
 if __name__ == "__main__":
     
     queries = ["What is the time in Bengaluru?", "What is the weather like right now in Dubai?"]
-    for query in queries:
-        asyncio.run(main(query))
+    # Results come back in the order of the queries, whatever order they finished in
+    for query, answer in zip(queries, asyncio.run(run_queries(queries))):
+        print(f"{query} -> {answer}")
@@ -1,15 +1,32 @@
 import datetime
 import os
-from zoneinfo import ZoneInfo
+import sys
+from contextlib import asynccontextmanager
+from typing import List, Optional
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from fastapi import FastAPI, HTTPException, Request
 
-import requests
 from starlette.applications import Starlette
+from starlette.middleware import Middleware
 from starlette.routing import Route, Mount
 import logging
 
 from mcp.server.fastmcp import FastMCP
 from mcp.server.sse import SseServerTransport
+from mcp_common.authenticators import (
+    ApiKeyAuthenticator,
+    ApiKeyStore,
+    AuthError,
+    AuthenticatorRegistry,
+    BasicAuthenticator,
+    BearerAuthenticator,
+    hash_secret,
+)
+from mcp_common.rate_limit import RateLimiter, RateLimitMiddleware
+from mcp_common.sessions import SessionLimitError, SessionRegistry, StreamClosed
+from mcp_common.streamable_http import StreamableHTTPEndpoint
+from mcp_common.timezones import TimezoneIndex, UnknownTimezone
+from mcp_common.weather import WeatherClient
 
 from dotenv import load_dotenv
 
@@ -26,92 +43,211 @@ mcp = FastMCP(
 )
 
 
+# City names, aliases and IANA zones, resolved without touching the tz database per call
+timezones = TimezoneIndex()
+
+
 @mcp.tool()
-def TimeTool(input_timezone):
-    "Provides the current time for a given city's timezone like Asia/Kolkata, America/New_York etc. If no timezone is provided, it returns the local time."
-    format = "%Y-%m-%d %H:%M:%S %Z%z"
-    current_time = datetime.datetime.now()    
+def TimeTool(input_timezone: Optional[str] = None, input_timezones: Optional[List[str]] = None):
+    "Provides the current time for a given city's timezone like Asia/Kolkata, America/New_York etc., or a city name like Bengaluru. If no timezone is provided, it returns the local time. Pass input_timezones to get the times in several timezones or cities at once."
+    current_time = datetime.datetime.now()
+    if input_timezones:
+        lines = []
+        for name in input_timezones:
+            try:
+                lines.append(f"The current time in {name} is {current_time.astimezone(timezones.resolve(name))}.")
+            except UnknownTimezone:
+                lines.append(f"Sorry, I couldn't find a timezone for {name}.")
+        return "\n".join(lines)
     if input_timezone:
-        print("TimeZone", input_timezone)
-        current_time =  current_time.astimezone(ZoneInfo(input_timezone))
+        try:
+            current_time = current_time.astimezone(timezones.resolve(input_timezone))
+        except UnknownTimezone:
+            return f"Sorry, I couldn't find a timezone for {input_timezone}."
     return f"The current time is {current_time}."
 
 transport = SseServerTransport("/messages/")
+# Abandoned SSE connections are closed after SSE_IDLE_TIMEOUT seconds without
+# traffic, and at most MAX_SSE_SESSIONS are open at once. Each session buffers
+# up to SSE_QUEUE_SIZE outgoing messages; SSE_SLOW_READER (block, shed or
+# disconnect) decides what happens when a client does not keep up.
+sessions = SessionRegistry(
+    transport,
+    max_sessions=int(os.getenv("MAX_SSE_SESSIONS", "1000")),
+    idle_timeout=float(os.getenv("SSE_IDLE_TIMEOUT", "900")),
+    max_queue=int(os.getenv("SSE_QUEUE_SIZE", "64")),
+    slow_reader=os.getenv("SSE_SLOW_READER", "block"),
+)
+
+
+# One pooled upstream client per worker. Lookups are cached per city for
+# WEATHER_CACHE_TTL seconds and concurrent lookups of a city share one request.
+weather = WeatherClient(
+    api_key=os.getenv("OPENWEATHERMAP_API_KEY"),
+    ttl=float(os.getenv("WEATHER_CACHE_TTL", "600")),
+    timeout=float(os.getenv("WEATHER_TIMEOUT", "5")),
+)
+# Upstream requests in flight at once for one bulk_weather_tool call
+WEATHER_CONCURRENCY = int(os.getenv("WEATHER_CONCURRENCY", "8"))
 
 
 @mcp.tool()
-def weather_tool(location: str):
+async def weather_tool(location: str):
     """Provides weather information for a given location"""
-        
-    api_key = os.getenv("OPENWEATHERMAP_API_KEY")
-    url = f"http://api.openweathermap.org/data/2.5/weather?q={location}&appid={api_key}&units=metric"
-    response = requests.get(url)
-    data = response.json()
-    if data["cod"] == 200:
+    data = await weather.current(location)
+    if data is not None:
         temp = data["main"]["temp"]
         description = data["weather"][0]["description"]
         return f"The weather in {location} is currently {description} with a temperature of {temp}°C."
     else:
         return f"Sorry, I couldn't find weather information for {location}."
+
+
+@mcp.tool()
+async def bulk_weather_tool(locations: List[str]):
+    """Provides weather information for several locations at once, one line per location"""
+    results = await weather.current_many(locations, concurrency=WEATHER_CONCURRENCY)
+    lines = []
+    failed = 0
+    for location, data in results.items():
+        if isinstance(data, Exception):
+            failed += 1
+            lines.append(f"Could not get the weather for {location} right now: {data!r}")
+        elif data is None:
+            lines.append(f"Sorry, I couldn't find weather information for {location}.")
+        else:
+            lines.append(f"The weather in {location} is currently {data['weather'][0]['description']} "
+                         f"with a temperature of {data['main']['temp']}°C.")
+    if failed:
+        lines.append(f"{failed} of {len(results)} locations could not be fetched.")
+    return "\n".join(lines)
     
+# Authenticators are chosen by the Authorization scheme (Basic/Bearer) or the
+# x-api-key header. API keys are stored hashed in API_KEYS_FILE, which is
+# reloaded automatically when it changes.
+API_KEYS_FILE = os.getenv("API_KEYS_FILE", os.path.join(os.path.dirname(os.path.abspath(__file__)), "api_keys.txt"))
+
+authenticators = AuthenticatorRegistry()
+authenticators.register(BasicAuthenticator({"user1": hash_secret("pass1")}))
+authenticators.register(BearerAuthenticator(os.getenv("JWT_SECRET", "secretjwt")))
+authenticators.register(ApiKeyAuthenticator(ApiKeyStore(API_KEYS_FILE)))
+
+
 def check_auth(request: Request):
-    auth = request.headers.get("authorization", "")
-    api_key = request.headers.get("x-api-key")
-    # Basic Auth (username:password is 'user1:pass1')
-    if auth.startswith("Basic "):
-        import base64
-        encoded = auth.split(" ", 1)[1]
-        user_pass = base64.b64decode(encoded).decode()
-        if user_pass == "user1:pass1":
-            return True
-    # Bearer Token / JWT (secret key "secretjwt")
-    if auth.startswith("Bearer "):
-        token = auth.split(" ", 1)[1]
+    # The rate limiter authenticates /sse and /mcp requests first; the outcome
+    # is kept in the request scope so each request is authenticated (and
+    # counted in auth_latency) once
+    outcome = request.scope.get("auth_outcome")
+    if outcome is None:
         try:
-            import jwt
-            payload = jwt.decode(token, "secretjwt", algorithms=["HS256"])
-            return True
-        except Exception:
-            raise HTTPException(status_code=401, detail="Invalid token")
-    # API Key (header "X-API-Key: secretkey")
-    if api_key == "secretkey":
-        return True
-    # If no valid auth provided
-    raise HTTPException(status_code=401, detail="Unauthorized")
+            outcome = authenticators.authenticate(request.headers)
+        except AuthError as e:
+            outcome = e
+        request.scope["auth_outcome"] = outcome
+    if isinstance(outcome, AuthError):
+        raise HTTPException(status_code=401, detail=outcome.detail)
+    return outcome
+
+
+# Token buckets per authenticated client, checked before /sse opens a session
+# or /messages/ hands a message to one. Rates are requests per second.
+rate_limits = {
+    "/sse": RateLimiter(
+        rate=float(os.getenv("SSE_RATE_LIMIT", "1")),
+        burst=float(os.getenv("SSE_RATE_BURST", "10")),
+    ),
+    "/messages/": RateLimiter(
+        rate=float(os.getenv("MESSAGES_RATE_LIMIT", "20")),
+        burst=float(os.getenv("MESSAGES_RATE_BURST", "50")),
+    ),
+    "/mcp": RateLimiter(
+        rate=float(os.getenv("MCP_RATE_LIMIT", "20")),
+        burst=float(os.getenv("MCP_RATE_BURST", "50")),
+    ),
+}
+
+
+def rate_limit_key(request: Request):
+    # Unauthenticated requests are limited by address instead. /messages/
+    # posts belong to a session authenticated at /sse, so their credentials
+    # only pick the bucket and are not timed.
+    if request.url.path.startswith("/messages/"):
+        principal = authenticators.identify(request.headers)
+        if principal is None:
+            return None
+    else:
+        principal = check_auth(request)
+    return f"{principal.scheme}:{principal.subject}"
 
 async def handle_sse(request):
     check_auth(request=request)
     # Prepare bidirectional streams over SSE
-    async with transport.connect_sse(
-        request.scope,
-        request.receive,
-        request._send
-    ) as (in_stream, out_stream):
-        # Run the MCP server: read JSON-RPC from in_stream, write replies to out_stream
-        await mcp._mcp_server.run(
-            in_stream,
-            out_stream,
-            mcp._mcp_server.create_initialization_options()
-        )
-
-
-#Build a small Starlette app for the two MCP endpoints
+    try:
+        async with sessions.connect_sse(
+            request.scope,
+            request.receive,
+            request._send
+        ) as (in_stream, out_stream):
+            # Run the MCP server: read JSON-RPC from in_stream, write replies to out_stream
+            await mcp._mcp_server.run(
+                in_stream,
+                out_stream,
+                mcp._mcp_server.create_initialization_options()
+            )
+    except SessionLimitError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    return StreamClosed()
+
+
+# Stateless streamable HTTP: each JSON-RPC request is authenticated and served
+# on its own, so requests can land on any worker
+streamable_http = StreamableHTTPEndpoint(mcp._mcp_server, authenticate=check_auth)
+
+
+#Build a small Starlette app for the MCP endpoints
 sse_app = Starlette(
     routes=[
         Route("/sse", handle_sse, methods=["GET"]),
         # Note the trailing slash to avoid 307 redirects
-        Mount("/messages/", app=transport.handle_post_message)
-    ]
+        Mount("/messages/", app=sessions.handle_post_message),
+        Route("/mcp", streamable_http, methods=["GET", "POST", "DELETE"]),
+    ],
+    middleware=[Middleware(RateLimitMiddleware, limits=rate_limits, identify=rate_limit_key)],
 )
 
 
-app = FastAPI()
-app.mount("/", sse_app)
+@asynccontextmanager
+async def lifespan(app):
+    async with streamable_http.lifespan(app):
+        yield
+    await weather.aclose()
+
+
+app = FastAPI(lifespan=lifespan)
 
 @app.get("/health")
 def read_root():
-    return {"message": "MCP SSE Server is running"}
+    return {"message": "MCP SSE Server is running", "sessions": sessions.live}
+
+
+@app.get("/metrics")
+def read_metrics():
+    return {
+        "auth_latency": authenticators.stats(),
+        "rate_limits": {route: limiter.stats() for route, limiter in rate_limits.items()},
+        "sessions": sessions.stats(),
+        "weather": weather.stats(),
+    }
+
+# Mount last so the catch-all does not shadow the routes above
+app.mount("/", sse_app)
 
 if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8100)
+    # With MCP_WORKERS > 1, /messages/ POSTs are routed to the worker that owns the session
+    workers = int(os.getenv("MCP_WORKERS", "1"))
+    if workers > 1:
+        from mcp_common.workers import run_workers
+        run_workers(app, host="0.0.0.0", port=8100, workers=workers)
+    else:
+        import uvicorn
+        uvicorn.run(app, host="0.0.0.0", port=8100)
@@ -1,13 +1,17 @@
 import asyncio
-import json
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from typing import Optional
-from mcp import ClientSession
-from mcp.client.sse import sse_client
-from openai import OpenAI
 import mcp.client.sse as _sse_mod
 from httpx import AsyncClient as _BaseAsyncClient
 from loguru import logger
-import aiohttp
+from mcp_common.concurrency import map_bounded
+from mcp_common.decision_cache import DecisionCache
+from mcp_common.llm import AsyncLLMClient
+from mcp_common.manifest import ToolManifest
+from mcp_common.mcp_client import PersistentMCPClient
+from mcp_common.token_manager import TokenManager
 
 from dotenv import load_dotenv
 
@@ -22,27 +26,11 @@ async def _patched_request(self, method, url, *args, **kwargs):
     return await _orig_request(self, method, url, *args, **kwargs)
 
 httpx.AsyncClient.request = _patched_request
-def llm_client(message: str):
-    client = OpenAI()
 
-    completion = client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[
-            {"role": "system", "content": "You are an intelligent Assistant. You will execute tasks as instructed"},
-            {
-                "role": "user",
-                "content": message,
-            },
-        ],
-    )
 
-    result = completion.choices[0].message.content
-    return result
-
-
-
-def get_prompt_to_identify_tool_and_arguements(query, tools):
-    tools_description = "\n".join([f"{tool.name}: {tool.description}, {tool.inputSchema}" for tool in tools.tools])
+def get_prompt_to_identify_tool_and_arguements(query, manifest: ToolManifest):
+    # Rendered once per tool list; see mcp_common.manifest
+    tools_description = manifest.description
     return  ("You are a helpful assistant with access to these tools:\n\n"
                 f"{tools_description}\n"
                 "Choose the appropriate tool based on the user's question. \n"
@@ -63,50 +51,64 @@ def get_prompt_to_identify_tool_and_arguements(query, tools):
 
 TOKEN_URL = "http://localhost:8100/token"
 SSE_URL = "http://localhost:8100/sse"
-
-async def get_token():
-    payload = {"client_id": "test_client", "client_secret": "secret_1234"}
-    async with aiohttp.ClientSession() as session:
-        async with session.post(TOKEN_URL, json=payload) as resp:
-            if resp.status != 200:
-                logger.error(f"Failed to get token: {resp.status}")
-                raise Exception("Unable to authenticate. Ensure you are using valid credentials")
-            data = await resp.json()
-            logger.info("Successfully generated token")
-            return data["access_token"]
-
-async def main(query:str):        
+# Queries in flight at once over the shared session; 1 runs them one by one
+QUERY_CONCURRENCY = int(os.getenv("QUERY_CONCURRENCY", "4"))
+# Tool decisions for repeated queries; set DECISION_CACHE_PATH to keep them between runs
+DECISION_CACHE_SIZE = int(os.getenv("DECISION_CACHE_SIZE", "1000"))
+DECISION_CACHE_TTL = float(os.getenv("DECISION_CACHE_TTL", str(24 * 3600)))
+DECISION_CACHE_PATH = os.getenv("DECISION_CACHE_PATH")
+
+async def main(query:str, client: PersistentMCPClient, llm: AsyncLLMClient, decisions: DecisionCache):        
     try:
-        auth_token = await get_token()    
-        headers = {"Authorization": f"Bearer {auth_token}"}
-        async with sse_client(url=SSE_URL,headers=headers) as (in_stream, out_stream):
-            # 2) Create an MCP session over those streams
-            async with ClientSession(in_stream, out_stream) as session:
-                # 3) Initialize
-                info = await session.initialize()
-                logger.info(f"Connected to {info.serverInfo.name} v{info.serverInfo.version}")
-
-                # 4) List tools
-                tools = (await session.list_tools())
-                logger.info(tools)            
-                
-                prompt = get_prompt_to_identify_tool_and_arguements(query,tools)
-                logger.info(f"Printing Prompt \n {prompt}")
-                
-                response = llm_client(prompt)
-                print(response)
-                
-                tool_call = json.loads(response)
-                            
-                result = await session.call_tool(tool_call["tool"], arguments=tool_call["arguments"])
-                logger.success(f"User query: {query}, Tool Response: {result.content[0].text}")
+        # Listed once per connection and re-fetched only when the server reports a change
+        manifest = await client.tool_manifest()
+        
+        tool_call = decisions.get(query, manifest.hash)
+        if tool_call is not None:
+            logger.info(f"Decision cache hit for {query!r}: {tool_call['tool']} (hit rate {decisions.stats()['hit_rate']:.0%})")
+        else:
+            prompt = get_prompt_to_identify_tool_and_arguements(query,manifest)
+            logger.info(f"Printing Prompt \n {prompt}")
+
+            # Streamed; returns as soon as the tool-call JSON closes, so the tool call
+            # goes out while the model may still be writing
+            tool_call, response = await llm.tool_call(prompt)
+            print(response)
+            if tool_call is None:
+                # No tool needed; the model answered directly
+                return response
+
+        result = await client.call_tool(tool_call["tool"], arguments=tool_call["arguments"])
+        if not result.isError:
+            # Only decisions that led to a successful tool call are reused
+            decisions.put(query, manifest.hash, tool_call)
+        logger.success(f"User query: {query}, Tool Response: {result.content[0].text}")
+        return result.content[0].text
     except Exception as e:
         print(f"Encountered error: {e}")
 
             
 
+async def run_queries(queries, concurrency: int = QUERY_CONCURRENCY):
+    decisions = DecisionCache(DECISION_CACHE_SIZE, DECISION_CACHE_TTL, DECISION_CACHE_PATH)
+    # One pooled LLM client for all queries as well
+    async with AsyncLLMClient() as llm, TokenManager(TOKEN_URL, "test_client", "secret_1234") as token_manager:
+        async def auth_headers():
+            # Called on every (re)connect, so a reconnect picks up a refreshed token
+            return {"Authorization": f"Bearer {await token_manager.get_token()}"}
+
+        # Requests from concurrent queries are multiplexed over the one session by JSON-RPC request id
+        async with PersistentMCPClient(SSE_URL, headers=auth_headers) as client:
+            try:
+                return await map_bounded(lambda query: main(query, client, llm, decisions), queries, concurrency)
+            finally:
+                decisions.save()
+                logger.info(f"Decision cache: {decisions.stats()}")
+
+
 if __name__ == "__main__":
     
     queries = ["What is the time in Bengaluru?", "What is the weather like right now in Dubai?"]
-    for query in queries:
-        asyncio.run(main(query))
+    # Results come back in the order of the queries, whatever order they finished in
+    for query, answer in zip(queries, asyncio.run(run_queries(queries))):
+        print(f"{query} -> {answer}")
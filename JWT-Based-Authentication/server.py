@@ -1,15 +1,27 @@
 import datetime
 import os
-from zoneinfo import ZoneInfo
+import sys
+from contextlib import asynccontextmanager
+import uuid
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from fastapi import  FastAPI, HTTPException, Request
-from pydantic import BaseModel
-import requests
+from pydantic import BaseModel, Field
+from typing import List, Optional
 from starlette.applications import Starlette
+from starlette.middleware import Middleware
 from starlette.routing import Route, Mount
 import jwt
 from mcp.server.fastmcp import FastMCP
 from mcp.server.sse import SseServerTransport
 from loguru import logger
+from mcp_common.token_cache import VerifiedTokenCache
+from mcp_common.revocation import RevocationStore
+from mcp_common.token_issuer import TokenIssuer, default_workers
+from mcp_common.rate_limit import RateLimiter, RateLimitMiddleware
+from mcp_common.sessions import SessionLimitError, SessionRegistry, StreamClosed
+from mcp_common.streamable_http import StreamableHTTPEndpoint
+from mcp_common.timezones import TimezoneIndex, UnknownTimezone
+from mcp_common.weather import WeatherClient
 
 from dotenv import load_dotenv
 
@@ -22,27 +34,59 @@ mcp = FastMCP(
 )
 
 
+# City names, aliases and IANA zones, resolved without touching the tz database per call
+timezones = TimezoneIndex()
+
+
 @mcp.tool()
-def TimeTool(input_timezone):
-    "Provides the current time for a given city's timezone like Asia/Kolkata, America/New_York etc. If no timezone is provided, it returns the local time."
-    format = "%Y-%m-%d %H:%M:%S %Z%z"
-    current_time = datetime.datetime.now()    
+def TimeTool(input_timezone: Optional[str] = None, input_timezones: Optional[List[str]] = None):
+    "Provides the current time for a given city's timezone like Asia/Kolkata, America/New_York etc., or a city name like Bengaluru. If no timezone is provided, it returns the local time. Pass input_timezones to get the times in several timezones or cities at once."
+    current_time = datetime.datetime.now()
+    if input_timezones:
+        lines = []
+        for name in input_timezones:
+            try:
+                lines.append(f"The current time in {name} is {current_time.astimezone(timezones.resolve(name))}.")
+            except UnknownTimezone:
+                lines.append(f"Sorry, I couldn't find a timezone for {name}.")
+        return "\n".join(lines)
     if input_timezone:
-        print("TimeZone", input_timezone)
-        current_time =  current_time.astimezone(ZoneInfo(input_timezone))
+        try:
+            current_time = current_time.astimezone(timezones.resolve(input_timezone))
+        except UnknownTimezone:
+            return f"Sorry, I couldn't find a timezone for {input_timezone}."
     return f"The current time is {current_time}."
 
 transport = SseServerTransport("/messages/")
+# Abandoned SSE connections are closed after SSE_IDLE_TIMEOUT seconds without
+# traffic, and at most MAX_SSE_SESSIONS are open at once. Each session buffers
+# up to SSE_QUEUE_SIZE outgoing messages; SSE_SLOW_READER (block, shed or
+# disconnect) decides what happens when a client does not keep up.
+sessions = SessionRegistry(
+    transport,
+    max_sessions=int(os.getenv("MAX_SSE_SESSIONS", "1000")),
+    idle_timeout=float(os.getenv("SSE_IDLE_TIMEOUT", "900")),
+    max_queue=int(os.getenv("SSE_QUEUE_SIZE", "64")),
+    slow_reader=os.getenv("SSE_SLOW_READER", "block"),
+)
+
+
+# One pooled upstream client per worker. Lookups are cached per city for
+# WEATHER_CACHE_TTL seconds and concurrent lookups of a city share one request.
+weather = WeatherClient(
+    api_key=os.getenv("OPENWEATHERMAP_API_KEY"),
+    ttl=float(os.getenv("WEATHER_CACHE_TTL", "600")),
+    timeout=float(os.getenv("WEATHER_TIMEOUT", "5")),
+)
+# Upstream requests in flight at once for one bulk_weather_tool call
+WEATHER_CONCURRENCY = int(os.getenv("WEATHER_CONCURRENCY", "8"))
 
 
 @mcp.tool()
-def weather_tool(location: str):
-    """Provides weather information for a given location"""        
-    api_key = os.getenv("OPENWEATHERMAP_API_KEY")
-    url = f"http://api.openweathermap.org/data/2.5/weather?q={location}&appid={api_key}&units=metric"
-    response = requests.get(url)
-    data = response.json()
-    if data["cod"] == 200:
+async def weather_tool(location: str):
+    """Provides weather information for a given location"""
+    data = await weather.current(location)
+    if data is not None:
         temp = data["main"]["temp"]
         description = data["weather"][0]["description"]
         return f"The weather in {location} is currently {description} with a temperature of {temp}°C."
@@ -50,49 +94,169 @@ def weather_tool(location: str):
         return f"Sorry, I couldn't find weather information for {location}."
 
 
+@mcp.tool()
+async def bulk_weather_tool(locations: List[str]):
+    """Provides weather information for several locations at once, one line per location"""
+    results = await weather.current_many(locations, concurrency=WEATHER_CONCURRENCY)
+    lines = []
+    failed = 0
+    for location, data in results.items():
+        if isinstance(data, Exception):
+            failed += 1
+            lines.append(f"Could not get the weather for {location} right now: {data!r}")
+        elif data is None:
+            lines.append(f"Sorry, I couldn't find weather information for {location}.")
+        else:
+            lines.append(f"The weather in {location} is currently {data['weather'][0]['description']} "
+                         f"with a temperature of {data['main']['temp']}°C.")
+    if failed:
+        lines.append(f"{failed} of {len(results)} locations could not be fetched.")
+    return "\n".join(lines)
+
+
 SECRET_KEY = "my_super_secret_key"
-ALGORITHM = "HS256"     
+ALGORITHM = "HS256"
+
+# Agents reconnect to /sse constantly with the same token, so remember which
+# tokens already passed verification instead of re-running HS256 every time.
+token_cache = VerifiedTokenCache(max_entries=int(os.getenv("TOKEN_CACHE_SIZE", "10000")))
+token_cache.bind_key(SECRET_KEY)
+
+
+# Tokens carry a jti so they can be revoked before their exp. Revocations are
+# appended to REVOCATION_FILE, so they survive restarts and reach every worker;
+# set it to an empty string to keep them in memory only.
+REVOCATION_FILE = os.getenv("REVOCATION_FILE", os.path.join(os.path.dirname(os.path.abspath(__file__)), "revoked.txt"))
+revocations = RevocationStore(path=REVOCATION_FILE or None)
+
+
+def rotate_secret_key(new_key: str):
+    """Switch to a new signing key; tokens verified under the old key are forgotten."""
+    global SECRET_KEY
+    SECRET_KEY = new_key
+    token_issuer.secret = new_key
+    token_cache.bind_key(new_key)
+
+
+def verify_token(token: str):
+    payload = token_cache.get(token)
+    if payload is None:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        token_cache.put(token, payload)
+    return payload
+
+
 def check_auth(request: Request):
+    # The rate limiter checks /sse and /mcp requests first; the outcome is
+    # kept in the request scope so each token is verified (and counted in the
+    # token cache stats) once per request
+    outcome = request.scope.get("auth_outcome")
+    if outcome is None:
+        outcome = request.scope["auth_outcome"] = _check_token(request)
+    if isinstance(outcome, HTTPException):
+        raise HTTPException(status_code=outcome.status_code, detail=outcome.detail)
+    return outcome
+
+
+def _check_token(request: Request):
+    # The token's claims, or the HTTPException rejecting the request
     auth = request.headers.get("authorization", "")        
     if auth.startswith("Bearer "):
         token = auth.split(" ", 1)[1]
         try:
-            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-            return True
+            payload = verify_token(token)
         except jwt.ExpiredSignatureError:
-            raise HTTPException(status_code=401, detail="Token expired")
+            return HTTPException(status_code=401, detail="Token expired")
         except jwt.InvalidTokenError:
-            raise HTTPException(status_code=401, detail="Invalid token")
+            return HTTPException(status_code=401, detail="Invalid token")
+        if revocations.is_revoked(payload.get("jti")):
+            return HTTPException(status_code=401, detail="Token revoked")
+        return payload
             
-    raise HTTPException(status_code=401, detail="Unauthorized")
+    return HTTPException(status_code=401, detail="Unauthorized")
+
+
+# Token buckets per token subject, checked before /sse opens a session or
+# /messages/ hands a message to one. Rates are requests per second.
+rate_limits = {
+    "/sse": RateLimiter(
+        rate=float(os.getenv("SSE_RATE_LIMIT", "1")),
+        burst=float(os.getenv("SSE_RATE_BURST", "10")),
+    ),
+    "/messages/": RateLimiter(
+        rate=float(os.getenv("MESSAGES_RATE_LIMIT", "20")),
+        burst=float(os.getenv("MESSAGES_RATE_BURST", "50")),
+    ),
+    "/mcp": RateLimiter(
+        rate=float(os.getenv("MCP_RATE_LIMIT", "20")),
+        burst=float(os.getenv("MCP_RATE_BURST", "50")),
+    ),
+}
+
+
+def rate_limit_key(request: Request):
+    # Requests without a valid token are limited by address instead. /messages/
+    # posts belong to a session verified at /sse: their token only picks the
+    # bucket, looked up without touching the cache's hit/miss counters.
+    if request.url.path.startswith("/messages/"):
+        auth = request.headers.get("authorization", "")
+        if not auth.startswith("Bearer "):
+            return None
+        token = auth.split(" ", 1)[1]
+        payload = token_cache.peek(token) or jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    else:
+        payload = check_auth(request)
+    return f"sub:{payload['sub']}"
 
 async def handle_sse(request):
     check_auth(request=request)
     # Prepare bidirectional streams over SSE
-    async with transport.connect_sse(
-        request.scope,
-        request.receive,
-        request._send
-    ) as (in_stream, out_stream):
-        # Run the MCP server: read JSON-RPC from in_stream, write replies to out_stream
-        await mcp._mcp_server.run(
-            in_stream,
-            out_stream,
-            mcp._mcp_server.create_initialization_options()
-        )
-
-
-#Build a small Starlette app for the two MCP endpoints
+    try:
+        async with sessions.connect_sse(
+            request.scope,
+            request.receive,
+            request._send
+        ) as (in_stream, out_stream):
+            # Run the MCP server: read JSON-RPC from in_stream, write replies to out_stream
+            await mcp._mcp_server.run(
+                in_stream,
+                out_stream,
+                mcp._mcp_server.create_initialization_options()
+            )
+    except SessionLimitError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    return StreamClosed()
+
+
+# Stateless streamable HTTP: each JSON-RPC request is authenticated and served
+# on its own, so requests can land on any worker
+streamable_http = StreamableHTTPEndpoint(mcp._mcp_server, authenticate=check_auth)
+
+
+#Build a small Starlette app for the MCP endpoints
 sse_app = Starlette(
     routes=[
         Route("/sse", handle_sse, methods=["GET"]),
         # Note the trailing slash to avoid 307 redirects
-        Mount("/messages/", app=transport.handle_post_message)
-    ]
+        Mount("/messages/", app=sessions.handle_post_message),
+        Route("/mcp", streamable_http, methods=["GET", "POST", "DELETE"]),
+    ],
+    middleware=[Middleware(RateLimitMiddleware, limits=rate_limits, identify=rate_limit_key)],
 )
 
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app):
+    # The signing pool (if any) forks on the main thread here, and every
+    # uvicorn worker shuts its own down on exit
+    token_issuer.start()
+    async with streamable_http.lifespan(app):
+        yield
+    token_issuer.shutdown()
+    await weather.aclose()
+
+
+app = FastAPI(lifespan=lifespan)
 
 # Mock client store
 CLIENTS = {
@@ -110,7 +274,8 @@ def generate_token(request: TokenRequest):
     if request.client_id in CLIENTS and CLIENTS[request.client_id] == request.client_secret:
         payload = {
             "sub": request.client_id,
-            "exp": datetime.datetime.now() + datetime.timedelta(minutes=60)
+            "exp": datetime.datetime.now() + datetime.timedelta(minutes=60),
+            "jti": uuid.uuid4().hex
         }
         token = jwt.encode(payload, SECRET_KEY, algorithm=ALGORITHM)
         return {"access_token": token}
@@ -118,13 +283,96 @@ def generate_token(request: TokenRequest):
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
 
+# Batch issuance for load generators and fleet bootstrap. With
+# TOKEN_SIGNING_WORKERS > 1 large batches are signed across a pool of worker
+# processes; by default HS256 is signed in-process, which a pool does not beat.
+MAX_BATCH_TOKENS = int(os.getenv("MAX_BATCH_TOKENS", "10000"))
+token_issuer = TokenIssuer(
+    SECRET_KEY,
+    algorithm=ALGORITHM,
+    lifetime_seconds=60 * 60,
+    workers=int(os.getenv("TOKEN_SIGNING_WORKERS", "0"))
+    or default_workers(ALGORITHM, server_processes=int(os.getenv("MCP_WORKERS", "1"))),
+)
+
+
+class BatchTokenRequest(BaseModel):
+    # Either a list of client credentials, or a single credential plus a count
+    clients: List[TokenRequest] = Field(default_factory=list, max_length=MAX_BATCH_TOKENS)
+    client_id: Optional[str] = None
+    client_secret: Optional[str] = None
+    count: int = Field(default=1, ge=1, le=MAX_BATCH_TOKENS)
+
+
+@app.post("/token/batch")
+def generate_token_batch(request: BatchTokenRequest):
+    credentials = [(c.client_id, c.client_secret) for c in request.clients]
+    if request.client_id is not None:
+        credentials.extend([(request.client_id, request.client_secret)] * request.count)
+    if not credentials:
+        raise HTTPException(status_code=400, detail="No client credentials provided")
+    if len(credentials) > MAX_BATCH_TOKENS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_TOKENS} tokens per batch")
+    # Each distinct credential is checked once, however many tokens it asks for
+    for client_id, client_secret in set(credentials):
+        if client_id not in CLIENTS or CLIENTS[client_id] != client_secret:
+            raise HTTPException(status_code=401, detail="Invalid credentials")
+    tokens = token_issuer.issue_many([client_id for client_id, _ in credentials])
+    return {"access_tokens": tokens}
+
+
+class RevokeRequest(BaseModel):
+    client_id: str
+    client_secret: str
+    token: str
+
+
+@app.post("/token/revoke")
+def revoke_token(request: RevokeRequest):
+    if request.client_id not in CLIENTS or CLIENTS[request.client_id] != request.client_secret:
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+    try:
+        payload = jwt.decode(request.token, SECRET_KEY, algorithms=[ALGORITHM])
+    except jwt.ExpiredSignatureError:
+        return {"revoked": False, "detail": "Token already expired"}
+    except jwt.InvalidTokenError:
+        raise HTTPException(status_code=400, detail="Invalid token")
+    # Clients may only revoke their own tokens
+    if payload.get("sub") != request.client_id:
+        raise HTTPException(status_code=403, detail="Token was not issued to this client")
+    if not payload.get("jti"):
+        raise HTTPException(status_code=400, detail="Token has no jti and cannot be revoked")
+    revocations.revoke(payload["jti"], payload["exp"])
+    return {"revoked": True}
+
+
 @app.get("/health")
 def read_root():
-    return {"message": "MCP SSE Server is running"}
+    return {"message": "MCP SSE Server is running", "sessions": sessions.live}
+
+
+@app.get("/metrics")
+def read_metrics():
+    return {
+        "token_cache": token_cache.stats(),
+        "revocations": revocations.stats(),
+        "rate_limits": {route: limiter.stats() for route, limiter in rate_limits.items()},
+        "sessions": sessions.stats(),
+        "weather": weather.stats(),
+    }
 
 app.mount("/", sse_app)
 
 if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8100)
+    # With MCP_WORKERS > 1, /messages/ POSTs are routed to the worker that owns the session
+    workers = int(os.getenv("MCP_WORKERS", "1"))
+    if workers > 1 and revocations.path is None:
+        # Each worker would only know the revocations it received itself
+        raise SystemExit("MCP_WORKERS > 1 needs REVOCATION_FILE so revocations reach every worker")
+    if workers > 1:
+        from mcp_common.workers import run_workers
+        run_workers(app, host="0.0.0.0", port=8100, workers=workers)
+    else:
+        import uvicorn
+        uvicorn.run(app, host="0.0.0.0", port=8100)
     
\ No newline at end of file
@@ -1,8 +1,7 @@
 import asyncio
 from crewai import Agent, Task, Crew, LLM
 from crewai_tools import MCPServerAdapter
-from fastmcp.server.auth.providers.bearer import RSAKeyPair
-from pydantic import SecretStr
+from rbac_auth.key_pairs import SigningKeyPair
 from dotenv import load_dotenv
 import os
 import jwt
@@ -24,10 +23,8 @@ async def main():
     with open("mcp_auth/public.pem", "r") as f:
         public_key_pem = f.read()
 
-    key_pair = RSAKeyPair(
-        private_key=SecretStr(private_key_pem),
-        public_key=public_key_pem
-    )
+    # RS256, ES256 or EdDSA, depending on what generate_keys.py produced
+    key_pair = SigningKeyPair.from_pem(private_key_pem, public_key_pem)
 
     token = key_pair.create_token(
         subject="alice",
@@ -42,7 +39,7 @@ async def main():
     claims = jwt.decode(
         token,
         public_key_pem,
-        algorithms=["RS256"],
+        algorithms=[key_pair.algorithm],
         audience="my-mcp-server",
         issuer="https://dev-issuer.com"
     )
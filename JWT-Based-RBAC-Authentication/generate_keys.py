@@ -1,20 +1,31 @@
-from fastmcp.server.auth.providers.bearer import RSAKeyPair
+import argparse
+from rbac_auth.key_pairs import ALGORITHMS, SigningKeyPair
 import os
 
-def generate_and_save_keys():
-    print("Generating new RSA key pair...")
-    key_pair = RSAKeyPair.generate()
+def generate_and_save_keys(algorithm="RS256", kid=None):
+    print(f"Generating new {algorithm} key pair...")
+    key_pair = SigningKeyPair.generate(algorithm)
 
     # Create mcp_auth directory if it doesn't exist
     os.makedirs("mcp_auth", exist_ok=True)
 
-    with open("mcp_auth/private.pem", "w") as f:
+    # The servers use the public key's file name as its kid, so rotated keys
+    # are written next to the current ones as <kid>.pem / <kid>.private.pem
+    private_path = f"mcp_auth/{kid}.private.pem" if kid else "mcp_auth/private.pem"
+    public_path = f"mcp_auth/{kid}.pem" if kid else "mcp_auth/public.pem"
+
+    with open(private_path, "w") as f:
         f.write(key_pair.private_key.get_secret_value())
-    print("Saved private key to mcp_auth/private.pem")
+    print(f"Saved private key to {private_path}")
 
-    with open("mcp_auth/public.pem", "w") as f:
+    with open(public_path, "w") as f:
         f.write(key_pair.public_key)
-    print("Saved public key to mcp_auth/public.pem")
+    print(f"Saved public key to {public_path}")
 
 if __name__ == "__main__":
-    generate_and_save_keys() 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Generate a key pair for signing MCP access tokens")
+    parser.add_argument("--algorithm", choices=list(ALGORITHMS), default="RS256",
+                        help="ES256 and EdDSA tokens are smaller and faster to sign; RS256 is fastest to verify")
+    parser.add_argument("--kid", help="Key id for rotation; tokens must then carry this kid in their header")
+    args = parser.parse_args()
+    generate_and_save_keys(args.algorithm, args.kid)
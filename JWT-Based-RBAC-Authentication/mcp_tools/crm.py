@@ -1,25 +1,36 @@
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 from fastmcp import FastMCP
-from fastmcp.server.auth import BearerAuthProvider
+from mcp_common.indexes import SecondaryIndex, UniqueIndex
+from mcp_common.revocation import RevocationStore
+from mcp_common.serialization import EncodedToolResult, tool_serializer
+from rbac_auth.keyset import PublicKeySet
+from rbac_auth.session_auth import SessionBoundBearerAuthProvider, run_sse
 from datetime import datetime, timedelta
 import uuid
 from typing import List, Dict, Optional
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 
-# Load public key from file
-with open("mcp_auth/public.pem", "r") as f:
-    public_key = f.read()
+# Public keys are parsed once from mcp_auth/ and reloaded in the background when they change
+MCP_AUTH_DIR = os.getenv("MCP_AUTH_DIR", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "mcp_auth"))
+key_set = PublicKeySet(MCP_AUTH_DIR).start()
+# Revoked token ids, shared by all RBAC servers (see revoke_token.py)
+revocations = RevocationStore(path=os.path.join(MCP_AUTH_DIR, "revoked.txt"))
 
-auth = BearerAuthProvider(
-    public_key=public_key,
+# Tokens are verified once at SSE connect; /messages/ posts are checked against the session binding
+auth = SessionBoundBearerAuthProvider(
+    key_set=key_set,
+    revocations=revocations,
     issuer="https://dev-issuer.com",
     audience="my-mcp-server",
 )
 
-mcp = FastMCP(name="CRMMCP", auth=auth)
+# Tools return their dataclass records as-is; tool_serializer encodes them to JSON in one pass,
+# and EncodedToolResult reuses that encoding as the structured content
+mcp = FastMCP(name="CRMMCP", auth=auth, tool_serializer=tool_serializer)
 
 # Data structures for customer relationship management
 @dataclass
@@ -243,6 +254,14 @@ DEAL_PIPELINE = {
     )
 }
 
+# Filters look records up by value instead of scanning the stores; the tools
+# that add or change records keep these in step
+CUSTOMER_INDEX = SecondaryIndex(("status", "industry"), CUSTOMER_PROFILES)
+INTERACTION_INDEX = SecondaryIndex(("customer_id", "interaction_type", "outcome"), INTERACTION_RECORDS)
+OPPORTUNITY_INDEX = SecondaryIndex(("stage", "customer_id"), SALES_OPPORTUNITIES)
+# Case-folded emails of all customers, for duplicate checks without a scan
+CUSTOMER_EMAILS = UniqueIndex("email_address", CUSTOMER_PROFILES)
+
 @mcp.tool()
 async def get_customer_profiles(customer_id: Optional[str] = None, status: Optional[str] = None,
                               industry: Optional[str] = None) -> Dict:
@@ -258,19 +277,13 @@ async def get_customer_profiles(customer_id: Optional[str] = None, status: Optio
     """
     if customer_id:
         if customer_id in CUSTOMER_PROFILES:
-            return {"customers": [asdict(CUSTOMER_PROFILES[customer_id])]}
+            return EncodedToolResult({"customers": [CUSTOMER_PROFILES[customer_id]]})
         else:
-            return {"customers": [], "message": f"Customer {customer_id} not found"}
+            return EncodedToolResult({"customers": [], "message": f"Customer {customer_id} not found"})
     
-    filtered_customers = []
-    for customer in CUSTOMER_PROFILES.values():
-        if status and customer.status != status:
-            continue
-        if industry and customer.industry != industry:
-            continue
-        filtered_customers.append(customer)
+    filtered_customers = CUSTOMER_INDEX.select(CUSTOMER_PROFILES, status=status, industry=industry)
     
-    return {"customers": [asdict(customer) for customer in filtered_customers]}
+    return EncodedToolResult({"customers": filtered_customers})
 
 @mcp.tool()
 async def add_customer_profile(company_name: str = None, contact_person: str = None, email_address: str = None,
@@ -324,15 +337,14 @@ async def add_customer_profile(company_name: str = None, contact_person: str = N
         missing_list = ", ".join(missing_fields)
         return f"❌ CUSTOMER PROFILE CREATION FAILED: Missing required information.\n\nMissing fields: {missing_list}\n\nPlease provide all required information and try again. Required fields are:\n- company_name: Name of the company\n- contact_person: Primary contact person\n- email_address: Contact email address\n- phone_number: Contact phone number\n- industry: Industry sector\n- company_size: Company size category\n- annual_revenue: Annual revenue in USD (must be >= 0)\n- lead_source: Source of the lead"
     
-    # Check if customer already exists (by email)
-    for customer in CUSTOMER_PROFILES.values():
-        if customer.email_address.lower() == email_address.lower():
-            return f"❌ CUSTOMER PROFILE CREATION FAILED: Customer with email {email_address} already exists"
-    
-    # Create the customer profile
     customer_id = f"CUST-{str(uuid.uuid4())[:8].upper()}"
     
-    CUSTOMER_PROFILES[customer_id] = CustomerProfile(
+    # Check if customer already exists (by email), reserving it for this customer in the same step
+    if not CUSTOMER_EMAILS.claim(email_address, customer_id):
+        return f"❌ CUSTOMER PROFILE CREATION FAILED: Customer with email {email_address} already exists"
+    
+    # Create the customer profile
+    customer = CUSTOMER_PROFILES[customer_id] = CustomerProfile(
         customer_id=customer_id,
         company_name=company_name.strip(),
         contact_person=contact_person.strip(),
@@ -347,6 +359,7 @@ async def add_customer_profile(company_name: str = None, contact_person: str = N
         last_contact_date=datetime.now(),
         notes=notes
     )
+    CUSTOMER_INDEX.add(customer_id, customer)
     
     return f"✅ Customer profile {customer_id} successfully created for {company_name}"
 
@@ -372,6 +385,7 @@ async def update_customer_status(customer_id: str, new_status: str, notes: str =
     customer = CUSTOMER_PROFILES[customer_id]
     old_status = customer.status
     customer.status = new_status
+    CUSTOMER_INDEX.update(customer_id, "status", old_status, new_status)
     
     if notes:
         customer.notes = notes
@@ -442,7 +456,7 @@ async def record_interaction(customer_id: str = None, interaction_type: str = No
     # Create the interaction record
     interaction_id = f"INT-{str(uuid.uuid4())[:8].upper()}"
     
-    INTERACTION_RECORDS[interaction_id] = InteractionRecord(
+    interaction = INTERACTION_RECORDS[interaction_id] = InteractionRecord(
         interaction_id=interaction_id,
         customer_id=customer_id.strip(),
         interaction_type=interaction_type.strip(),
@@ -455,6 +469,7 @@ async def record_interaction(customer_id: str = None, interaction_type: str = No
         duration_minutes=duration_minutes,
         notes=notes
     )
+    INTERACTION_INDEX.add(interaction_id, interaction)
     
     # Update customer's last contact date
     CUSTOMER_PROFILES[customer_id].last_contact_date = datetime.now()
@@ -476,19 +491,12 @@ async def get_interaction_history(customer_id: Optional[str] = None, interaction
     """
     if customer_id:
         if customer_id not in CUSTOMER_PROFILES:
-            return {"interactions": [], "message": f"Customer {customer_id} not found"}
-    
-    filtered_interactions = []
-    for interaction in INTERACTION_RECORDS.values():
-        if customer_id and interaction.customer_id != customer_id:
-            continue
-        if interaction_type and interaction.interaction_type != interaction_type:
-            continue
-        if outcome and interaction.outcome != outcome:
-            continue
-        filtered_interactions.append(interaction)
-    
-    return {"interactions": [asdict(interaction) for interaction in filtered_interactions]}
+            return EncodedToolResult({"interactions": [], "message": f"Customer {customer_id} not found"})
+    
+    filtered_interactions = INTERACTION_INDEX.select(INTERACTION_RECORDS, customer_id=customer_id,
+                                                     interaction_type=interaction_type, outcome=outcome)
+    
+    return EncodedToolResult({"interactions": filtered_interactions})
 
 @mcp.tool()
 async def create_sales_opportunity(customer_id: str = None, opportunity_name: str = None, description: str = None,
@@ -563,7 +571,7 @@ async def create_sales_opportunity(customer_id: str = None, opportunity_name: st
     # Create the opportunity
     opportunity_id = f"OPP-{str(uuid.uuid4())[:8].upper()}"
     
-    SALES_OPPORTUNITIES[opportunity_id] = SalesOpportunity(
+    opportunity = SALES_OPPORTUNITIES[opportunity_id] = SalesOpportunity(
         opportunity_id=opportunity_id,
         customer_id=customer_id.strip(),
         opportunity_name=opportunity_name.strip(),
@@ -577,6 +585,7 @@ async def create_sales_opportunity(customer_id: str = None, opportunity_name: st
         lead_source=lead_source.strip(),
         notes=notes
     )
+    OPPORTUNITY_INDEX.add(opportunity_id, opportunity)
     
     return f"✅ Opportunity {opportunity_id} successfully created for {opportunity_name} with value ${value:,.2f}"
 
@@ -595,19 +604,13 @@ async def get_sales_opportunities(opportunity_id: Optional[str] = None, stage: O
     """
     if opportunity_id:
         if opportunity_id in SALES_OPPORTUNITIES:
-            return {"opportunities": [asdict(SALES_OPPORTUNITIES[opportunity_id])]}
+            return EncodedToolResult({"opportunities": [SALES_OPPORTUNITIES[opportunity_id]]})
         else:
-            return {"opportunities": [], "message": f"Opportunity {opportunity_id} not found"}
+            return EncodedToolResult({"opportunities": [], "message": f"Opportunity {opportunity_id} not found"})
     
-    filtered_opportunities = []
-    for opportunity in SALES_OPPORTUNITIES.values():
-        if stage and opportunity.stage != stage:
-            continue
-        if customer_id and opportunity.customer_id != customer_id:
-            continue
-        filtered_opportunities.append(opportunity)
+    filtered_opportunities = OPPORTUNITY_INDEX.select(SALES_OPPORTUNITIES, stage=stage, customer_id=customer_id)
     
-    return {"opportunities": [asdict(opportunity) for opportunity in filtered_opportunities]}
+    return EncodedToolResult({"opportunities": filtered_opportunities})
 
 @mcp.tool()
 async def get_crm_summary() -> Dict:
@@ -642,4 +645,4 @@ async def get_crm_summary() -> Dict:
     }
 
 if __name__ == "__main__":
-    mcp.run(transport="sse", port=8003)
+    run_sse(mcp, auth, port=8003)
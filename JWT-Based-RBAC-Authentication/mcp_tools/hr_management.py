@@ -1,26 +1,37 @@
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 from fastmcp import FastMCP
-from fastmcp.server.auth import BearerAuthProvider
+from mcp_common.indexes import UniqueIndex
+from mcp_common.revocation import RevocationStore
+from mcp_common.serialization import EncodedToolResult, tool_serializer
+from rbac_auth.keyset import PublicKeySet
+from rbac_auth.session_auth import SessionBoundBearerAuthProvider, run_sse
 from datetime import datetime, timedelta
 import uuid
 from typing import List, Dict, Optional
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from enum import Enum
 
-# Load public key from file
-with open("mcp_auth/public.pem", "r") as f:
-    public_key = f.read()
+# Public keys are parsed once from mcp_auth/ and reloaded in the background when they change
+MCP_AUTH_DIR = os.getenv("MCP_AUTH_DIR", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "mcp_auth"))
+key_set = PublicKeySet(MCP_AUTH_DIR).start()
+# Revoked token ids, shared by all RBAC servers (see revoke_token.py)
+revocations = RevocationStore(path=os.path.join(MCP_AUTH_DIR, "revoked.txt"))
 
-auth = BearerAuthProvider(
-    public_key=public_key,
+# Tokens are verified once at SSE connect; /messages/ posts are checked against the session binding
+auth = SessionBoundBearerAuthProvider(
+    key_set=key_set,
+    revocations=revocations,
     issuer="https://dev-issuer.com",
     audience="my-mcp-server",
 )
 
-mcp = FastMCP(name="HRManagementMCP", auth=auth)
+# Tools return their dataclass records as-is; tool_serializer encodes them to JSON in one pass,
+# and EncodedToolResult reuses that encoding as the structured content
+mcp = FastMCP(name="HRManagementMCP", auth=auth, tool_serializer=tool_serializer)
 
 # Enums for HR management
 class EmploymentStatus(Enum):
@@ -176,6 +187,9 @@ PERFORMANCE_REVIEWS = {
     )
 }
 
+# Case-folded emails of all employees, for duplicate checks without a scan
+EMPLOYEE_EMAILS = UniqueIndex("email", EMPLOYEE_RECORDS)
+
 @mcp.tool()
 async def add_employee_record(first_name: str = None, last_name: str = None, email: str = None,
                             phone: str = None, department: str = None, position: str = None,
@@ -253,14 +267,13 @@ async def add_employee_record(first_name: str = None, last_name: str = None, ema
     if manager_id and manager_id not in EMPLOYEE_RECORDS:
         return f"❌ EMPLOYEE RECORD CREATION FAILED: Manager {manager_id} not found"
     
-    # Check if email already exists
-    for employee in EMPLOYEE_RECORDS.values():
-        if employee.email.lower() == email.lower():
-            return f"❌ EMPLOYEE RECORD CREATION FAILED: Employee with email {email} already exists"
-    
-    # Create the employee record
     employee_id = f"EMP-{str(uuid.uuid4())[:8].upper()}"
     
+    # Check if email already exists, reserving it for this employee in the same step
+    if not EMPLOYEE_EMAILS.claim(email, employee_id):
+        return f"❌ EMPLOYEE RECORD CREATION FAILED: Employee with email {email} already exists"
+    
+    # Create the employee record
     EMPLOYEE_RECORDS[employee_id] = EmployeeRecord(
         employee_id=employee_id,
         first_name=first_name.strip(),
@@ -296,9 +309,9 @@ async def get_employee_records(employee_id: Optional[str] = None, department: Op
     """
     if employee_id:
         if employee_id in EMPLOYEE_RECORDS:
-            return {"employees": [asdict(EMPLOYEE_RECORDS[employee_id])]}
+            return EncodedToolResult({"employees": [EMPLOYEE_RECORDS[employee_id]]})
         else:
-            return {"employees": [], "message": f"Employee {employee_id} not found"}
+            return EncodedToolResult({"employees": [], "message": f"Employee {employee_id} not found"})
     
     filtered_employees = []
     for employee in EMPLOYEE_RECORDS.values():
@@ -308,7 +321,7 @@ async def get_employee_records(employee_id: Optional[str] = None, department: Op
             continue
         filtered_employees.append(employee)
     
-    return {"employees": [asdict(employee) for employee in filtered_employees]}
+    return EncodedToolResult({"employees": filtered_employees})
 
 @mcp.tool()
 async def create_leave_request(employee_id: str = None, leave_type: str = None, start_date: str = None,
@@ -420,4 +433,4 @@ async def get_hr_summary() -> Dict:
     }
 
 if __name__ == "__main__":
-    mcp.run(transport="sse", port=8001)
+    run_sse(mcp, auth, port=8001)
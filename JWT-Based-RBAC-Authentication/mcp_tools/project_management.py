@@ -1,27 +1,37 @@
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 from fastmcp import FastMCP, Context
-from fastmcp.server.auth import BearerAuthProvider
+from mcp_common.revocation import RevocationStore
+from mcp_common.serialization import EncodedToolResult, tool_serializer
+from rbac_auth.keyset import PublicKeySet
+from rbac_auth.session_auth import SessionBoundBearerAuthProvider, run_sse
 from fastmcp.server.auth.providers.bearer import RSAKeyPair
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from datetime import datetime
 import uuid
 from typing import List, Dict, Optional
 from enum import Enum
 
-# Load public key from file
-with open("mcp_auth/public.pem", "r") as f:
-    public_key = f.read()
+# Public keys are parsed once from mcp_auth/ and reloaded in the background when they change
+MCP_AUTH_DIR = os.getenv("MCP_AUTH_DIR", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "mcp_auth"))
+key_set = PublicKeySet(MCP_AUTH_DIR).start()
+# Revoked token ids, shared by all RBAC servers (see revoke_token.py)
+revocations = RevocationStore(path=os.path.join(MCP_AUTH_DIR, "revoked.txt"))
 
-auth = BearerAuthProvider(
-    public_key=public_key,
+# Tokens are verified once at SSE connect; /messages/ posts are checked against the session binding
+auth = SessionBoundBearerAuthProvider(
+    key_set=key_set,
+    revocations=revocations,
     issuer="https://dev-issuer.com",
     audience="my-mcp-server",
 )
 
-mcp = FastMCP(name="ProjectManagementMCP", auth=auth)
+# Tools return their dataclass records as-is; tool_serializer encodes them to JSON in one pass,
+# and EncodedToolResult reuses that encoding as the structured content
+mcp = FastMCP(name="ProjectManagementMCP", auth=auth, tool_serializer=tool_serializer)
 
 # Enums for project management
 class TaskPriority(Enum):
@@ -305,9 +315,9 @@ async def get_project_tasks(task_id: Optional[str] = None, project_id: Optional[
     """
     if task_id:
         if task_id in PROJECT_TASKS:
-            return {"tasks": [asdict(PROJECT_TASKS[task_id])]}
+            return EncodedToolResult({"tasks": [PROJECT_TASKS[task_id]]})
         else:
-            return {"tasks": [], "message": f"Task {task_id} not found"}
+            return EncodedToolResult({"tasks": [], "message": f"Task {task_id} not found"})
     
     filtered_tasks = []
     for task in PROJECT_TASKS.values():
@@ -319,7 +329,7 @@ async def get_project_tasks(task_id: Optional[str] = None, project_id: Optional[
             continue
         filtered_tasks.append(task)
     
-    return {"tasks": [asdict(task) for task in filtered_tasks]}
+    return EncodedToolResult({"tasks": filtered_tasks})
 
 @mcp.tool()
 async def update_task_state(task_id: str, new_state: str, actual_hours: Optional[float] = None,
@@ -402,12 +412,12 @@ async def get_overdue_tasks() -> Dict:
     
     for task in PROJECT_TASKS.values():
         if task.due_date < current_date and task.state != TaskState.COMPLETED:
-            overdue_tasks.append(asdict(task))
+            overdue_tasks.append(task)
     
-    return {
+    return EncodedToolResult({
         "overdue_tasks": overdue_tasks,
         "count": len(overdue_tasks)
-    }
+    })
 
 @mcp.tool()
 async def get_project_summary() -> Dict:
@@ -437,4 +447,4 @@ async def get_project_summary() -> Dict:
     }
 
 if __name__ == "__main__":
-    mcp.run(transport="sse", port=8002)
+    run_sse(mcp, auth, port=8002)
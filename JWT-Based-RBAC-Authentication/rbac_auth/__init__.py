@@ -0,0 +1 @@
+"""Authentication helpers shared by the RBAC MCP servers in mcp_tools/."""
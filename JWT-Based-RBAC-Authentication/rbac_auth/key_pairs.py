@@ -0,0 +1,121 @@
+"""Signing key pairs for RS256, ES256 and EdDSA (Ed25519) tokens.
+
+``SigningKeyPair`` has the same shape as FastMCP's ``RSAKeyPair``
+(``private_key``, ``public_key``, ``generate()``, ``create_token()``) but
+can also produce the smaller, faster-to-sign ES256 and EdDSA tokens.
+"""
+import time
+import uuid
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Any, Dict, List, Optional, Union
+
+from authlib.jose import JsonWebToken
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+from pydantic import SecretStr
+
+
+def _generate_rs256():
+    return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+def _generate_es256():
+    return ec.generate_private_key(ec.SECP256R1())
+
+
+def _generate_eddsa():
+    return ed25519.Ed25519PrivateKey.generate()
+
+
+# JWS algorithm name -> private key factory
+ALGORITHMS = {
+    "RS256": _generate_rs256,
+    "ES256": _generate_es256,
+    "EdDSA": _generate_eddsa,
+}
+
+
+def algorithm_for_key(key) -> str:
+    """Return the JWS algorithm used with a cryptography public or private key."""
+    if isinstance(key, (rsa.RSAPublicKey, rsa.RSAPrivateKey)):
+        return "RS256"
+    if isinstance(key, (ec.EllipticCurvePublicKey, ec.EllipticCurvePrivateKey)):
+        if not isinstance(key.curve, ec.SECP256R1):
+            raise ValueError(f"Unsupported curve {key.curve.name}, only P-256 (ES256) is supported")
+        return "ES256"
+    if isinstance(key, (ed25519.Ed25519PublicKey, ed25519.Ed25519PrivateKey)):
+        return "EdDSA"
+    raise ValueError(f"Unsupported key type {type(key).__name__}")
+
+
+@dataclass(frozen=True, kw_only=True, repr=False)
+class SigningKeyPair:
+    private_key: SecretStr
+    public_key: str
+    algorithm: str = "RS256"
+
+    @classmethod
+    def generate(cls, algorithm: str = "RS256") -> "SigningKeyPair":
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"Unsupported algorithm {algorithm}. Choose one of {list(ALGORITHMS)}")
+        private_key = ALGORITHMS[algorithm]()
+        private_pem = private_key.private_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PrivateFormat.PKCS8,
+            encryption_algorithm=serialization.NoEncryption(),
+        ).decode("utf-8")
+        public_pem = private_key.public_key().public_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PublicFormat.SubjectPublicKeyInfo,
+        ).decode("utf-8")
+        return cls(private_key=SecretStr(private_pem), public_key=public_pem, algorithm=algorithm)
+
+    @classmethod
+    def from_pem(cls, private_key_pem: str, public_key_pem: str) -> "SigningKeyPair":
+        """Build a key pair from PEM files, detecting the algorithm from the key type."""
+        private_key = serialization.load_pem_private_key(private_key_pem.encode(), password=None)
+        return cls(
+            private_key=SecretStr(private_key_pem),
+            public_key=public_key_pem,
+            algorithm=algorithm_for_key(private_key),
+        )
+
+    @cached_property
+    def _signing_key(self):
+        # Parsed once; authlib would otherwise re-parse the PEM for every token
+        return serialization.load_pem_private_key(self.private_key.get_secret_value().encode(), password=None)
+
+    def create_token(
+        self,
+        subject: str = "fastmcp-user",
+        issuer: str = "https://fastmcp.example.com",
+        audience: Optional[Union[str, List[str]]] = None,
+        scopes: Optional[List[str]] = None,
+        expires_in_seconds: int = 3600,
+        additional_claims: Optional[Dict[str, Any]] = None,
+        kid: Optional[str] = None,
+    ) -> str:
+        """Sign a token with the claims ``RSAKeyPair.create_token`` produces plus a ``jti``.
+
+        The ``jti`` lets the servers revoke a token before it expires.
+        """
+        now = int(time.time())
+        payload = {
+            "iss": issuer,
+            "sub": subject,
+            "iat": now,
+            "exp": now + expires_in_seconds,
+            "jti": uuid.uuid4().hex,
+        }
+        if audience:
+            payload["aud"] = audience
+        if scopes:
+            payload["scope"] = " ".join(scopes)
+        if additional_claims:
+            payload.update(additional_claims)
+
+        header = {"alg": self.algorithm}
+        if kid:
+            header["kid"] = kid
+        return JsonWebToken([self.algorithm]).encode(header, payload, key=self._signing_key).decode("utf-8")
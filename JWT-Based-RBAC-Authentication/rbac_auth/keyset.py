@@ -0,0 +1,125 @@
+"""Public verification keys loaded from a directory of PEM files.
+
+Every public-key PEM in the directory is parsed once into a ready-to-use
+verification key and registered under its file name without the extension,
+which is the ``kid`` tokens must carry in their header (``public.pem`` ->
+``kid`` "public"). Files that do not hold a public key, such as
+``private.pem``, are ignored. A background thread polls the directory and
+swaps in a freshly parsed key set when any file changes, so keys can be
+rotated without restarting the servers.
+
+RSA, P-256 and Ed25519 keys are accepted; each key only verifies tokens
+whose header names its algorithm (RS256, ES256 or EdDSA respectively).
+"""
+import logging
+import os
+import threading
+from typing import Dict, Optional, Tuple
+
+from authlib.jose import ECKey, OKPKey, RSAKey
+from cryptography.hazmat.primitives.asymmetric import ec, rsa
+from cryptography.hazmat.primitives.serialization import load_pem_public_key
+
+from rbac_auth.key_pairs import algorithm_for_key
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_KID = "public"
+
+
+def parse_public_key(pem: bytes) -> Tuple[str, object]:
+    """Parse a PEM public key into its JWS algorithm and authlib verification key."""
+    public_key = load_pem_public_key(pem)
+    algorithm = algorithm_for_key(public_key)
+    if isinstance(public_key, rsa.RSAPublicKey):
+        return algorithm, RSAKey.import_key(public_key)
+    if isinstance(public_key, ec.EllipticCurvePublicKey):
+        return algorithm, ECKey.import_key(public_key)
+    return algorithm, OKPKey.import_key(public_key)
+
+
+class PublicKeySet:
+    def __init__(self, directory: str, reload_interval: float = 2.0):
+        self.directory = directory
+        self.reload_interval = reload_interval
+        # (kid -> (algorithm, key), default kid) is replaced as one tuple so readers never see a half-built set
+        self._state: Tuple[Dict[str, object], Optional[str]] = ({}, None)
+        self._signature = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.reloads = 0
+        self.reload()
+
+    def __len__(self):
+        return len(self._state[0])
+
+    @property
+    def kids(self):
+        return sorted(self._state[0])
+
+    def _directory_signature(self):
+        try:
+            entries = sorted(os.scandir(self.directory), key=lambda e: e.name)
+        except FileNotFoundError:
+            return ()
+        return tuple(
+            (e.name, e.stat().st_mtime_ns, e.stat().st_size)
+            for e in entries if e.name.endswith(".pem") and e.is_file()
+        )
+
+    def reload(self) -> bool:
+        """Re-parse the directory if it changed. Returns True when a new set was swapped in."""
+        signature = self._directory_signature()
+        if signature == self._signature:
+            return False
+        keys = {}
+        for name, _, _ in signature:
+            try:
+                with open(os.path.join(self.directory, name), "rb") as f:
+                    keys[name[:-len(".pem")]] = parse_public_key(f.read())
+            except (OSError, ValueError, TypeError) as e:
+                # Private keys and unrelated PEMs live in the same directory
+                logger.debug("Skipping %s: %s", name, e)
+        if DEFAULT_KID in keys:
+            default_kid = DEFAULT_KID
+        elif len(keys) == 1:
+            default_kid = next(iter(keys))
+        else:
+            default_kid = None
+        self._state = (keys, default_kid)
+        self._signature = signature
+        self.reloads += 1
+        logger.info("Loaded %d public key(s) from %s: %s", len(keys), self.directory, sorted(keys))
+        return True
+
+    def get(self, kid: Optional[str]) -> Tuple[str, object]:
+        keys, default_kid = self._state
+        entry = keys.get(kid if kid is not None else default_kid)
+        if entry is None:
+            raise ValueError(f"No public key for kid {kid!r}")
+        return entry
+
+    def resolve(self, header: Dict, payload=None):
+        """Key callback for ``JsonWebToken.decode``: pick the key named by the header's kid."""
+        algorithm, key = self.get(header.get("kid"))
+        # Never let a token choose a different algorithm than its key was made for
+        if header.get("alg") != algorithm:
+            raise ValueError(f"Token algorithm {header.get('alg')!r} does not match key algorithm {algorithm}")
+        return key
+
+    def _watch(self):
+        while not self._stop.wait(self.reload_interval):
+            try:
+                self.reload()
+            except Exception:
+                logger.exception("Reloading public keys from %s failed", self.directory)
+
+    def start(self) -> "PublicKeySet":
+        """Start polling the directory for changes in a daemon thread."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._watch, name="public-key-watcher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
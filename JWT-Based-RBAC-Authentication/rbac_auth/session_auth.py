@@ -0,0 +1,175 @@
+"""Verify a bearer token once per SSE session instead of once per request.
+
+``BearerAuthProvider`` checks the RS256 signature on every HTTP request,
+including every JSON-RPC ``/messages/`` POST of an SSE session that was
+already authenticated at connect time. ``SessionBoundBearerAuthProvider``
+runs the full verification on the ``/sse`` GET, binds the resulting access
+token to the session id handed to the client, and afterwards only checks
+that a POST carries the same token and that it has not expired.
+
+Given a ``PublicKeySet``, the provider verifies against the pre-parsed key
+named by the token's ``kid`` instead of a single PEM string, and accepts
+RS256, ES256 and EdDSA tokens according to that key's type. With a
+revocation store, tokens whose ``jti`` has been revoked are rejected both at
+connect and on every POST of an open session.
+"""
+import base64
+import hashlib
+import hmac
+import json
+import re
+import time
+from contextvars import ContextVar
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs
+
+from authlib.jose import JsonWebToken
+from fastmcp.server.auth import BearerAuthProvider
+from mcp.server.auth.provider import AccessToken
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from rbac_auth.key_pairs import ALGORITHMS
+from rbac_auth.keyset import PublicKeySet
+
+# The ASGI scope of the request being authenticated. Set by SessionAuthMiddleware,
+# which wraps the auth middleware, because load_access_token only sees the token.
+_current_scope: ContextVar[Optional[Scope]] = ContextVar("session_auth_scope", default=None)
+
+_SESSION_ID_RE = re.compile(rb"session_id=([0-9a-fA-F]{32})")
+
+
+def _digest(token: str) -> bytes:
+    return hashlib.sha256(token.encode()).digest()
+
+
+def _token_id(token: str) -> Optional[str]:
+    # Only called on tokens whose signature has already been verified
+    payload = token.split(".")[1]
+    payload += "=" * (-len(payload) % 4)
+    return json.loads(base64.urlsafe_b64decode(payload)).get("jti")
+
+
+class SessionBoundBearerAuthProvider(BearerAuthProvider):
+    def __init__(self, *args, key_set: Optional[PublicKeySet] = None, revocations=None,
+                 sse_path: str = "/sse", message_path: str = "/messages/", **kwargs):
+        if key_set is not None:
+            # BearerAuthProvider requires a key source; with a key set it is never fetched
+            kwargs.setdefault("jwks_uri", f"file://{key_set.directory}")
+        super().__init__(*args, **kwargs)
+        self.key_set = key_set
+        self.revocations = revocations
+        if key_set is not None:
+            # Each key in the set pins its own algorithm (see PublicKeySet.resolve)
+            self.jwt = JsonWebToken(list(ALGORITHMS))
+        self.sse_path = sse_path.rstrip("/")
+        self.message_path = message_path.rstrip("/")
+        self._sessions: Dict[str, Tuple[bytes, AccessToken, Optional[str]]] = {}
+        self.full_verifications = 0
+        self.session_hits = 0
+
+    def bind(self, session_id: str, access_token: AccessToken) -> None:
+        self._sessions[session_id.lower()] = (
+            _digest(access_token.token), access_token, _token_id(access_token.token)
+        )
+
+    def unbind(self, session_id: str) -> None:
+        self._sessions.pop(session_id.lower(), None)
+
+    def _message_session_id(self) -> Optional[str]:
+        scope = _current_scope.get()
+        if scope is None or scope["method"] != "POST" or scope["path"].rstrip("/") != self.message_path:
+            return None
+        values = parse_qs(scope.get("query_string", b"").decode()).get("session_id")
+        return values[0].lower() if values else None
+
+    async def _get_verification_key(self, token: str):
+        if self.key_set is not None:
+            return self.key_set.resolve
+        return await super()._get_verification_key(token)
+
+    async def load_access_token(self, token: str) -> Optional[AccessToken]:
+        session_id = self._message_session_id()
+        bound = self._sessions.get(session_id) if session_id else None
+        if bound is None:
+            self.full_verifications += 1
+            access_token = await super().load_access_token(token)
+            if access_token is not None and self._is_revoked(_token_id(token)):
+                return None
+            return access_token
+        digest, access_token, jti = bound
+        # A bound session only accepts the token it was opened with
+        if not hmac.compare_digest(digest, _digest(token)):
+            return None
+        if access_token.expires_at and access_token.expires_at < time.time():
+            return None
+        if self._is_revoked(jti):
+            return None
+        self.session_hits += 1
+        return access_token
+
+    def _is_revoked(self, jti: Optional[str]) -> bool:
+        return self.revocations is not None and self.revocations.is_revoked(jti)
+
+    def install(self, app) -> None:
+        """Add the session middleware outside the app's auth middleware."""
+        app.add_middleware(SessionAuthMiddleware, provider=self)
+
+    def stats(self) -> Dict:
+        return {
+            "public_keys": self.key_set.kids if self.key_set is not None else [],
+            "bound_sessions": len(self._sessions),
+            "full_verifications": self.full_verifications,
+            "session_hits": self.session_hits,
+        }
+
+
+class SessionAuthMiddleware:
+    """Exposes the request scope to the provider and binds new SSE sessions.
+
+    The session id is read from the ``endpoint`` event as it is sent, so the
+    binding exists before the client can POST to the session.
+    """
+
+    def __init__(self, app: ASGIApp, provider: SessionBoundBearerAuthProvider):
+        self.app = app
+        self.provider = provider
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        reset_token = _current_scope.set(scope)
+        try:
+            if scope["method"] == "GET" and scope["path"].rstrip("/") == self.provider.sse_path:
+                await self._serve_sse(scope, receive, send)
+            else:
+                await self.app(scope, receive, send)
+        finally:
+            _current_scope.reset(reset_token)
+
+    async def _serve_sse(self, scope: Scope, receive: Receive, send: Send) -> None:
+        session_ids = []
+
+        async def binding_send(message: Message) -> None:
+            if not session_ids and message["type"] == "http.response.body":
+                match = _SESSION_ID_RE.search(message.get("body", b""))
+                # scope["user"] is filled in by the auth middleware after a full verification
+                access_token = getattr(scope.get("user"), "access_token", None)
+                if match and access_token is not None:
+                    session_ids.append(match.group(1).decode())
+                    self.provider.bind(session_ids[0], access_token)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, binding_send)
+        finally:
+            for session_id in session_ids:
+                self.provider.unbind(session_id)
+
+
+def run_sse(server, auth: SessionBoundBearerAuthProvider, port: int, host: str = "127.0.0.1") -> None:
+    """Serve ``server`` over SSE like ``server.run(transport="sse")`` with session-bound auth."""
+    import uvicorn
+
+    app = server.http_app(transport="sse")
+    auth.install(app)
+    uvicorn.run(app, host=host, port=port, timeout_graceful_shutdown=0, lifespan="on")
@@ -0,0 +1,24 @@
+import argparse
+import os
+import sys
+import jwt
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mcp_common.revocation import append_revocation
+
+# The same file the RBAC servers read, whatever the current directory
+MCP_AUTH_DIR = os.getenv("MCP_AUTH_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "mcp_auth"))
+REVOCATION_FILE = os.path.join(MCP_AUTH_DIR, "revoked.txt")
+
+def revoke_token(token, path=REVOCATION_FILE):
+    # The RBAC servers watch this file and reject the token's jti until it expires
+    claims = jwt.decode(token, options={"verify_signature": False})
+    if "jti" not in claims:
+        raise SystemExit("Token has no jti claim and cannot be revoked")
+    append_revocation(path, claims["jti"], claims["exp"])
+    print(f"Revoked token {claims['jti']} for {claims.get('sub')} until {claims['exp']}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Revoke an access token on all RBAC MCP servers")
+    parser.add_argument("token")
+    revoke_token(parser.parse_args().token)
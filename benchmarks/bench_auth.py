@@ -0,0 +1,172 @@
+"""Per-request authentication cost of every auth path in the repo.
+
+Covers the API-key server's check_auth (API key, Basic, HS256 Bearer), the
+JWT server's check_auth (HS256) and the RBAC servers' RS256 verification
+through BearerAuthProvider, each with valid, expired and invalid
+credentials. Valid HS256 tokens are measured both warm (served from the
+verified-token cache) and cold (cache cleared before every call).
+
+Prints a table and, with --json, writes the results for regression tracking:
+
+    python benchmarks/bench_auth.py --iterations 5000 --json bench_auth.json
+"""
+import argparse
+import asyncio
+import base64
+import importlib.util
+import json
+import logging
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, "JWT-Based-RBAC-Authentication"))
+
+import jwt
+from fastapi import HTTPException
+from fastmcp.server.auth import BearerAuthProvider
+from fastmcp.server.auth.providers.bearer import RSAKeyPair
+from starlette.datastructures import Headers
+
+from rbac_auth.keyset import PublicKeySet
+from rbac_auth.session_auth import SessionBoundBearerAuthProvider
+
+ISSUER = "https://dev-issuer.com"
+AUDIENCE = "my-mcp-server"
+
+
+def load_server(directory, name):
+    # Both demo servers are called server.py, so load them under distinct names
+    spec = importlib.util.spec_from_file_location(name, os.path.join(ROOT, directory, "server.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def request(headers):
+    return SimpleNamespace(headers=Headers(headers), scope={})
+
+
+def hs256(secret, expires_in):
+    return jwt.encode({"sub": "bench", "exp": int(time.time()) + expires_in}, secret, algorithm="HS256")
+
+
+def check_auth_case(check_auth, headers, before=None):
+    def run():
+        if before is not None:
+            before()
+        try:
+            # A fresh request each time: check_auth keeps its outcome in the request's scope
+            return check_auth(request(headers))
+        except HTTPException:
+            return None
+    return run
+
+
+def provider_case(provider, token):
+    async def run():
+        return await provider.load_access_token(token)
+    return run
+
+
+def build_cases():
+    api_server = load_server("API-Key-Based-Authentication", "api_key_server")
+    jwt_server = load_server("JWT-Based-Authentication", "jwt_server")
+    bearer_cache = api_server.authenticators._by_scheme["bearer"].cache
+
+    key_pair = RSAKeyPair.generate()
+    key_dir = tempfile.mkdtemp(prefix="bench_auth_keys_")
+    with open(os.path.join(key_dir, "public.pem"), "w") as f:
+        f.write(key_pair.public_key)
+    stock = BearerAuthProvider(public_key=key_pair.public_key, issuer=ISSUER, audience=AUDIENCE)
+    keyed = SessionBoundBearerAuthProvider(key_set=PublicKeySet(key_dir), issuer=ISSUER, audience=AUDIENCE)
+    rs_valid = key_pair.create_token(subject="bench", issuer=ISSUER, audience=AUDIENCE)
+    rs_expired = key_pair.create_token(subject="bench", issuer=ISSUER, audience=AUDIENCE, expires_in_seconds=-60)
+    rs_invalid = RSAKeyPair.generate().create_token(subject="bench", issuer=ISSUER, audience=AUDIENCE)
+
+    basic = lambda creds: {"authorization": "Basic " + base64.b64encode(creds).decode()}
+    api_hs = lambda token: {"authorization": f"Bearer {token}"}
+    api_secret = os.getenv("JWT_SECRET", "secretjwt")
+
+    cases = [
+        ("api-key-server", "api-key", "valid", check_auth_case(api_server.check_auth, {"x-api-key": "secretkey"})),
+        ("api-key-server", "api-key", "invalid", check_auth_case(api_server.check_auth, {"x-api-key": "wrong"})),
+        ("api-key-server", "basic", "valid", check_auth_case(api_server.check_auth, basic(b"user1:pass1"))),
+        ("api-key-server", "basic", "invalid", check_auth_case(api_server.check_auth, basic(b"user1:wrong"))),
+        ("api-key-server", "hs256", "valid", check_auth_case(api_server.check_auth, api_hs(hs256(api_secret, 3600)))),
+        ("api-key-server", "hs256", "valid-cold", check_auth_case(
+            api_server.check_auth, api_hs(hs256(api_secret, 3600)), before=bearer_cache.clear)),
+        ("api-key-server", "hs256", "expired", check_auth_case(api_server.check_auth, api_hs(hs256(api_secret, -60)))),
+        ("api-key-server", "hs256", "invalid", check_auth_case(api_server.check_auth, api_hs(hs256("wrong", 3600)))),
+        ("jwt-server", "hs256", "valid", check_auth_case(
+            jwt_server.check_auth, api_hs(hs256(jwt_server.SECRET_KEY, 3600)))),
+        ("jwt-server", "hs256", "valid-cold", check_auth_case(
+            jwt_server.check_auth, api_hs(hs256(jwt_server.SECRET_KEY, 3600)), before=jwt_server.token_cache.clear)),
+        ("jwt-server", "hs256", "expired", check_auth_case(
+            jwt_server.check_auth, api_hs(hs256(jwt_server.SECRET_KEY, -60)))),
+        ("jwt-server", "hs256", "invalid", check_auth_case(jwt_server.check_auth, api_hs(hs256("wrong", 3600)))),
+        ("rbac-servers", "rs256-bearer-provider", "valid", provider_case(stock, rs_valid)),
+        ("rbac-servers", "rs256-bearer-provider", "expired", provider_case(stock, rs_expired)),
+        ("rbac-servers", "rs256-bearer-provider", "invalid", provider_case(stock, rs_invalid)),
+        ("rbac-servers", "rs256-key-set", "valid", provider_case(keyed, rs_valid)),
+        ("rbac-servers", "rs256-key-set", "expired", provider_case(keyed, rs_expired)),
+        ("rbac-servers", "rs256-key-set", "invalid", provider_case(keyed, rs_invalid)),
+    ]
+    return cases, key_dir
+
+
+def measure(run, iterations):
+    loop = asyncio.new_event_loop() if asyncio.iscoroutinefunction(run) else None
+    call = (lambda: loop.run_until_complete(run())) if loop else run
+    for _ in range(min(100, iterations)):
+        call()
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter_ns()
+        call()
+        samples.append(time.perf_counter_ns() - start)
+    if loop:
+        loop.close()
+    samples.sort()
+    return {
+        "iterations": iterations,
+        "ops_per_sec": iterations / (sum(samples) / 1e9),
+        "p50_us": samples[len(samples) // 2] / 1000,
+        "p99_us": samples[min(len(samples) - 1, int(len(samples) * 0.99))] / 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--json", help="Write results to this file as JSON")
+    args = parser.parse_args()
+
+    cases, key_dir = build_cases()
+    # Rejections are logged at INFO by FastMCP; keep log output out of the timings
+    logging.disable(logging.INFO)
+    results = []
+    print(f"{'server':<16}{'scheme':<24}{'case':<12}{'ops/s':>12}{'p50 us':>10}{'p99 us':>10}")
+    try:
+        for server, scheme, case, run in cases:
+            result = {"server": server, "scheme": scheme, "case": case, **measure(run, args.iterations)}
+            results.append(result)
+            print(f"{server:<16}{scheme:<24}{case:<12}{result['ops_per_sec']:>12.0f}"
+                  f"{result['p50_us']:>10.1f}{result['p99_us']:>10.1f}")
+    finally:
+        shutil.rmtree(key_dir, ignore_errors=True)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"python": platform.python_version(), "results": results}, f, indent=2)
+        print(f"Wrote {args.json}")
+
+
+if __name__ == "__main__":
+    main()
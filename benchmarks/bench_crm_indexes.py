@@ -0,0 +1,115 @@
+"""get_interaction_history filtering: scanning the store versus SecondaryIndex.
+
+The records mirror crm's InteractionRecord. Each query is one of the tool's
+filter combinations (customer, type, outcome and their intersections), run
+against a store of ``--records`` interactions over ``--customers``
+customers, first by scanning as the tool did before and then through the
+index the tool now keeps.
+
+    python benchmarks/bench_crm_indexes.py --records 300000
+"""
+import argparse
+import dataclasses
+import datetime
+import os
+import random
+import sys
+import time
+from typing import Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+from mcp_common.indexes import SecondaryIndex
+
+INTERACTION_TYPES = ["call", "email", "meeting", "demo", "proposal"]
+OUTCOMES = ["positive", "negative", "neutral", "follow_up"]
+
+
+@dataclasses.dataclass
+class InteractionRecord:
+    interaction_id: str
+    customer_id: str
+    interaction_type: str
+    subject: str
+    description: str
+    outcome: str
+    next_action: str
+    interaction_date: datetime.datetime
+    created_by: str
+    duration_minutes: Optional[int]
+    notes: str
+
+
+def make_records(count, customers):
+    rng = random.Random(7)
+    now = datetime.datetime(2024, 1, 1)
+    return {
+        f"INT-{i:07d}": InteractionRecord(
+            interaction_id=f"INT-{i:07d}",
+            customer_id=f"CUST-{rng.randrange(customers):05d}",
+            interaction_type=rng.choice(INTERACTION_TYPES),
+            subject="Follow up",
+            description="",
+            outcome=rng.choice(OUTCOMES),
+            next_action="",
+            interaction_date=now,
+            created_by="sales_rep_1",
+            duration_minutes=None,
+            notes="",
+        )
+        for i in range(count)
+    }
+
+
+def scan(records, customer_id=None, interaction_type=None, outcome=None):
+    # The loop get_interaction_history ran before
+    filtered = []
+    for interaction in records.values():
+        if customer_id and interaction.customer_id != customer_id:
+            continue
+        if interaction_type and interaction.interaction_type != interaction_type:
+            continue
+        if outcome and interaction.outcome != outcome:
+            continue
+        filtered.append(interaction)
+    return filtered
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=300_000)
+    parser.add_argument("--customers", type=int, default=5_000)
+    parser.add_argument("--queries", type=int, default=20)
+    args = parser.parse_args()
+
+    records = make_records(args.records, args.customers)
+    start = time.perf_counter()
+    index = SecondaryIndex(("customer_id", "interaction_type", "outcome"), records)
+    build = time.perf_counter() - start
+
+    rng = random.Random(11)
+    shapes = {
+        "customer": lambda: {"customer_id": f"CUST-{rng.randrange(args.customers):05d}"},
+        "type": lambda: {"interaction_type": rng.choice(INTERACTION_TYPES)},
+        "type+outcome": lambda: {"interaction_type": rng.choice(INTERACTION_TYPES), "outcome": rng.choice(OUTCOMES)},
+        "customer+type": lambda: {"customer_id": f"CUST-{rng.randrange(args.customers):05d}",
+                                  "interaction_type": rng.choice(INTERACTION_TYPES)},
+    }
+    print(f"{args.records} records, index built in {build * 1000:.0f} ms")
+    print(f"{'filter':<16}{'scan ms':>10}{'index ms':>10}{'speedup':>10}")
+    for name, make_filters in shapes.items():
+        queries = [make_filters() for _ in range(args.queries)]
+        timings = []
+        for run in (lambda f: scan(records, **f), lambda f: index.select(records, **f)):
+            start = time.perf_counter()
+            for filters in queries:
+                run(filters)
+            timings.append((time.perf_counter() - start) / len(queries))
+        for filters in queries:
+            assert scan(records, **filters) == index.select(records, **filters)
+        print(f"{name:<16}{timings[0] * 1000:>10.2f}{timings[1] * 1000:>10.3f}{timings[0] / timings[1]:>10.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""Time to a dispatchable tool call: per-query sync OpenAI client versus the pooled async client.
+
+Starts benchmarks/stub_llm_server.py in-process on a free port and sends
+the clients' tool-selection prompt for a batch of queries, with bounded
+concurrency:
+
+- sync-per-query: what the clients did before, a new ``OpenAI()`` per
+  query run in a thread, then ``json.loads`` on the full completion
+- async-pooled: one ``AsyncLLMClient``, full completion, then parsing
+- async-streaming: one ``AsyncLLMClient``, ``tool_call`` returns when the
+  JSON object closes
+
+Latency is from sending the prompt to having the tool name and arguments.
+
+    python benchmarks/bench_llm_client.py --queries 200 --concurrency 8 --token-delay 0.01
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import socket
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import uvicorn
+from openai import OpenAI
+
+from mcp_common.llm import SYSTEM_PROMPT, AsyncLLMClient
+import stub_llm_server
+
+PROMPT = ("You are a helpful assistant with access to these tools:\n\n"
+          "TimeTool: Get the current time in the given timezone\n"
+          "weather_tool: Get the current weather for a location\n"
+          "User's Question: {query}\n")
+QUERIES = ["What is the time in Bengaluru?", "What is the weather like right now in Dubai?"]
+
+
+def start_server(app):
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    return server, thread, f"http://127.0.0.1:{port}/v1"
+
+
+def sync_per_query(base_url):
+    def call(prompt):
+        client = OpenAI(base_url=base_url, api_key="stub")
+        completion = client.chat.completions.create(
+            model="stub", messages=[{"role": "system", "content": SYSTEM_PROMPT}, {"role": "user", "content": prompt}])
+        return json.loads(completion.choices[0].message.content.split("\n\n")[0])
+
+    async def run(prompt):
+        return await asyncio.to_thread(call, prompt)
+
+    return run, None
+
+
+def async_pooled(base_url):
+    llm = AsyncLLMClient(model="stub", base_url=base_url, api_key="stub")
+
+    async def run(prompt):
+        return json.loads((await llm.complete(prompt)).split("\n\n")[0])
+
+    return run, llm
+
+
+def async_streaming(base_url):
+    llm = AsyncLLMClient(model="stub", base_url=base_url, api_key="stub")
+
+    async def run(prompt):
+        tool_call, _ = await llm.tool_call(prompt)
+        return tool_call
+
+    return run, llm
+
+
+async def drive(factory, base_url, queries, concurrency):
+    run, llm = factory(base_url)
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(query):
+        async with semaphore:
+            start = time.perf_counter()
+            tool_call = await run(PROMPT.format(query=query))
+            latencies.append(time.perf_counter() - start)
+            assert tool_call["tool"] in ("TimeTool", "weather_tool"), tool_call
+
+    try:
+        await one(QUERIES[0])  # warm up
+        latencies.clear()
+        start = time.perf_counter()
+        await asyncio.gather(*(one(QUERIES[i % len(QUERIES)]) for i in range(queries)))
+        elapsed = time.perf_counter() - start
+    finally:
+        if llm is not None:
+            await llm.close()
+    latencies.sort()
+    return {
+        "queries_per_sec": queries / elapsed,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p99_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--token-delay", type=float, default=0.01)
+    args = parser.parse_args()
+
+    stub_llm_server.STUB_LLM_TOKEN_DELAY = args.token_delay
+    # The OpenAI SDK logs every request at INFO through httpx
+    logging.disable(logging.INFO)
+    server, thread, base_url = start_server(stub_llm_server.app)
+    try:
+        print(f"{'client':<18}{'queries/s':>10}{'p50 ms':>10}{'p99 ms':>10}")
+        for name, factory in (("sync-per-query", sync_per_query), ("async-pooled", async_pooled),
+                              ("async-streaming", async_streaming)):
+            result = asyncio.run(drive(factory, base_url, args.queries, args.concurrency))
+            print(f"{name:<18}{result['queries_per_sec']:>10.1f}{result['p50_ms']:>10.2f}{result['p99_ms']:>10.2f}")
+    finally:
+        server.should_exit = True
+        thread.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""Encoding cost of a get_* tool result: asdict + FastMCP's serializer versus mcp_common.serialization.
+
+The records mirror hr_management's EmployeeRecord (strings, a float, a
+datetime, an Enum and an Optional). Compared paths for one result holding
+all records:
+
+- asdict: what the tools did before, ``[asdict(r) for r in records]`` then
+  FastMCP's default serializer (pydantic_core.to_json with indent=2)
+- serialization: the dataclasses as they are, through tool_serializer
+  (orjson when installed)
+- serialization-stdlib: the same without orjson
+
+A tool call costs more than the encoding: for a result annotated ``Dict``
+FastMCP's ``Tool.run`` also converts it to structured content. The
+``tool-run`` rows time the whole ``Tool.run`` of a get_* style tool:
+
+- tool-run asdict: asdict copies through the default serializer, as before
+- tool-run dict: the dataclasses returned in a dict through tool_serializer
+- tool-run encoded: an ``EncodedToolResult``, encoded once and parsed back
+  as the structured content
+
+    python benchmarks/bench_serialization.py --records 100000
+"""
+import argparse
+import asyncio
+import dataclasses
+import datetime
+import enum
+import json
+import os
+import sys
+import time
+from typing import Dict, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+import pydantic_core
+from fastmcp.tools.tool import Tool
+
+from mcp_common import serialization
+
+
+class EmploymentStatus(enum.Enum):
+    ACTIVE = "active"
+    ON_LEAVE = "on_leave"
+
+
+@dataclasses.dataclass
+class EmployeeRecord:
+    employee_id: str
+    first_name: str
+    last_name: str
+    email: str
+    department: str
+    position: str
+    hire_date: datetime.datetime
+    salary: float
+    employment_status: EmploymentStatus
+    manager_id: Optional[str]
+    notes: str
+
+
+def make_records(count):
+    hired = datetime.datetime(2022, 3, 15)
+    return [
+        EmployeeRecord(
+            employee_id=f"EMP-{i:06d}",
+            first_name="John",
+            last_name="Smith",
+            email=f"john.smith{i}@company.com",
+            department="Engineering",
+            position="Senior Software Engineer",
+            hire_date=hired + datetime.timedelta(days=i % 1000),
+            salary=95000.0 + i,
+            employment_status=EmploymentStatus.ACTIVE if i % 7 else EmploymentStatus.ON_LEAVE,
+            manager_id=None if i % 10 == 0 else "EMP-000001",
+            notes="",
+        )
+        for i in range(count)
+    ]
+
+
+def asdict_path(records):
+    return pydantic_core.to_json({"employees": [dataclasses.asdict(r) for r in records]},
+                                 fallback=str, indent=2).decode()
+
+
+def stdlib_dumps(obj):
+    encoder = json.JSONEncoder(default=serialization._default, ensure_ascii=False, separators=(",", ":"))
+    return encoder.encode(obj)
+
+
+def tool_runs(records):
+    # The shapes get_employee_records has had: (name, tool function, serializer)
+    def asdict_tool() -> Dict:
+        return {"employees": [dataclasses.asdict(r) for r in records]}
+
+    def dict_tool() -> Dict:
+        return {"employees": records}
+
+    def encoded_tool() -> Dict:
+        return serialization.EncodedToolResult({"employees": records})
+
+    return [
+        ("tool-run asdict", Tool.from_function(asdict_tool)),
+        ("tool-run dict", Tool.from_function(dict_tool, serializer=serialization.tool_serializer)),
+        ("tool-run encoded", Tool.from_function(encoded_tool, serializer=serialization.tool_serializer)),
+    ]
+
+
+def run_tool(tool):
+    result = asyncio.run(tool.run({}))
+    return result.content[0].text, result.structured_content
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    records = make_records(args.records)
+    paths = [
+        ("asdict", lambda: asdict_path(records)),
+        ("serialization", lambda: serialization.tool_serializer({"employees": records})),
+        ("serialization-stdlib", lambda: stdlib_dumps({"employees": records})),
+    ]
+    # All paths must produce the same document
+    expected = json.loads(paths[0][1]())
+    for name, run in paths[1:]:
+        assert json.loads(run()) == expected, name
+    for name, tool in tool_runs(records):
+        text, structured = run_tool(tool)
+        assert json.loads(text) == structured == expected, name
+        paths.append((name, lambda tool=tool: run_tool(tool)[0]))
+
+    print(f"orjson: {'yes' if serialization.orjson is not None else 'no'}, {args.records} records")
+    print(f"{'path':<22}{'best ms':>10}{'records/s':>14}{'bytes':>12}")
+    for name, run in paths:
+        best = float("inf")
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            output = run()
+            best = min(best, time.perf_counter() - start)
+        print(f"{name:<22}{best * 1000:>10.1f}{args.records / best:>14.0f}{len(output.encode()):>12}")
+
+
+if __name__ == "__main__":
+    main()
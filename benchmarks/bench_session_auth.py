@@ -0,0 +1,67 @@
+"""Per-POST auth cost: BearerAuthProvider vs. SessionBoundBearerAuthProvider.
+
+Every JSON-RPC POST to /messages/ inside an SSE session goes through the
+provider's load_access_token. This measures that call in-process for the
+stock provider (RS256 verification each time) and for the session-bound
+provider after the session has been bound at connect.
+
+    python benchmarks/bench_session_auth.py --iterations 2000
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+import uuid
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(ROOT, "JWT-Based-RBAC-Authentication"))
+
+from fastmcp.server.auth import BearerAuthProvider
+from fastmcp.server.auth.providers.bearer import RSAKeyPair
+
+from rbac_auth.session_auth import SessionBoundBearerAuthProvider, _current_scope
+
+ISSUER = "https://dev-issuer.com"
+AUDIENCE = "my-mcp-server"
+
+
+async def bench(provider, token, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        assert await provider.load_access_token(token) is not None
+    return time.perf_counter() - start
+
+
+async def main(iterations):
+    key_pair = RSAKeyPair.generate()
+    token = key_pair.create_token(subject="alice", issuer=ISSUER, audience=AUDIENCE)
+    baseline = BearerAuthProvider(public_key=key_pair.public_key, issuer=ISSUER, audience=AUDIENCE)
+    session_bound = SessionBoundBearerAuthProvider(public_key=key_pair.public_key, issuer=ISSUER, audience=AUDIENCE)
+
+    # Simulate the /sse connect: one full verification, then bind the session
+    session_id = uuid.uuid4().hex
+    session_bound.bind(session_id, await session_bound.load_access_token(token))
+    _current_scope.set({
+        "type": "http",
+        "method": "POST",
+        "path": "/messages/",
+        "query_string": f"session_id={session_id}".encode(),
+    })
+
+    await bench(baseline, token, 50)
+    await bench(session_bound, token, 50)
+    rows = [
+        ("BearerAuthProvider (RS256 per POST)", await bench(baseline, token, iterations)),
+        ("SessionBoundBearerAuthProvider", await bench(session_bound, token, iterations)),
+    ]
+    print(f"{'provider':<38}{'ops/s':>12}{'us/op':>10}")
+    for name, seconds in rows:
+        print(f"{name:<38}{iterations / seconds:>12.0f}{seconds / iterations * 1e6:>10.1f}")
+    print(f"speed-up: {rows[0][1] / rows[1][1]:.0f}x; provider stats: {session_bound.stats()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=2000)
+    asyncio.run(main(parser.parse_args().iterations))
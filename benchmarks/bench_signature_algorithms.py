@@ -0,0 +1,55 @@
+"""Verifications per second and token size for RS256, ES256 and EdDSA.
+
+Tokens are minted with the same claims the RBAC client uses and verified
+the way the RBAC servers do: authlib's JsonWebToken with a key parsed once
+by PublicKeySet.
+
+    python benchmarks/bench_signature_algorithms.py --iterations 2000
+"""
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(ROOT, "JWT-Based-RBAC-Authentication"))
+
+from authlib.jose import JsonWebToken
+
+from rbac_auth.key_pairs import ALGORITHMS, SigningKeyPair
+from rbac_auth.keyset import parse_public_key
+
+CLAIMS = {"job_role": "Manager", "id": "123", "name": "Alice"}
+
+
+def bench(algorithm, iterations):
+    key_pair = SigningKeyPair.generate(algorithm)
+    _, public_key = parse_public_key(key_pair.public_key.encode())
+    decoder = JsonWebToken([algorithm])
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        token = key_pair.create_token(subject="alice", issuer="https://dev-issuer.com",
+                                      audience="my-mcp-server", additional_claims=CLAIMS)
+    sign_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        decoder.decode(token, public_key)
+    verify_seconds = time.perf_counter() - start
+    return len(token), iterations / sign_seconds, iterations / verify_seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"{'algorithm':<10}{'token bytes':>12}{'signs/s':>12}{'verifies/s':>12}")
+    for algorithm in ALGORITHMS:
+        size, signs, verifies = bench(algorithm, args.iterations)
+        print(f"{algorithm:<10}{size:>12}{signs:>12.0f}{verifies:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
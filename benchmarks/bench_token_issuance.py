@@ -0,0 +1,97 @@
+"""Tokens per second: one POST /token per token vs. a single POST /token/batch,
+and TokenIssuer.issue_many signed in-process vs. across a process pool.
+
+The HTTP rows run the JWT-Based-Authentication app in-process through
+Starlette's TestClient, so the numbers include request parsing and response
+encoding but not the network. The issue_many rows call the issuer directly
+with ``workers=1`` and ``workers=--workers``; ``--algorithm RS256`` signs
+with a generated RSA key, where the pool has something to parallelise.
+
+    python benchmarks/bench_token_issuance.py --count 10000 --workers 4
+"""
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, "JWT-Based-Authentication"))
+
+from starlette.testclient import TestClient
+
+import server
+from mcp_common.token_issuer import TokenIssuer
+
+CREDENTIALS = {"client_id": "test_client", "client_secret": "secret_1234"}
+
+
+def bench_single(client, count):
+    start = time.perf_counter()
+    for _ in range(count):
+        response = client.post("/token", json=CREDENTIALS)
+        assert response.status_code == 200
+    return time.perf_counter() - start
+
+
+def bench_batch(client, count):
+    start = time.perf_counter()
+    response = client.post("/token/batch", json={**CREDENTIALS, "count": count})
+    assert response.status_code == 200 and len(response.json()["access_tokens"]) == count
+    return time.perf_counter() - start
+
+
+def signing_key(algorithm):
+    if algorithm.startswith("HS"):
+        return server.SECRET_KEY
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import rsa
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    return key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8,
+                             serialization.NoEncryption()).decode()
+
+
+def bench_issue_many(algorithm, workers, count, repeat):
+    issuer = TokenIssuer(signing_key(algorithm), algorithm=algorithm, workers=workers).start()
+    client_ids = ["test_client"] * count
+    try:
+        issuer.issue_many(client_ids[:issuer.chunk_size * 2])  # warm-up
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            tokens = issuer.issue_many(client_ids)
+            best = min(best, time.perf_counter() - start)
+        assert len(tokens) == count
+    finally:
+        issuer.shutdown()
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--algorithm", default="HS256", choices=["HS256", "RS256"])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rows = []
+    # The lifespan starts (and stops) the server's signing pool, if it has one
+    with TestClient(server.app) as client:
+        # Warm up both paths before timing
+        bench_single(client, 10)
+        bench_batch(client, min(args.count, server.MAX_BATCH_TOKENS))
+        rows.append(("/token", "HS256", 1, bench_single(client, args.count)))
+        rows.append(("/token/batch", "HS256", server.token_issuer.workers, bench_batch(client, args.count)))
+    for workers in (1, args.workers):
+        rows.append(("issue_many", args.algorithm, workers,
+                     bench_issue_many(args.algorithm, workers, args.count, args.repeat)))
+
+    print(f"{os.cpu_count()} CPUs, {args.count} tokens")
+    print(f"{'path':<14}{'algorithm':>10}{'workers':>9}{'seconds':>10}{'tokens/s':>12}")
+    for path, algorithm, workers, seconds in rows:
+        print(f"{path:<14}{algorithm:>10}{workers:>9}{seconds:>10.3f}{args.count / seconds:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Tool-call throughput over SSE versus stateless streamable HTTP.
+
+Starts the API-key server in-process on a free port and drives TimeTool
+through the official MCP clients: one SSE session (GET /sse plus POSTs to
+/messages/) and one streamable-HTTP session (a POST to /mcp per request).
+Calls are issued with bounded concurrency and rate limits are lifted so the
+transports, not the limiter, are measured.
+
+    python benchmarks/bench_transports.py --calls 2000 --concurrency 16
+"""
+import argparse
+import asyncio
+import importlib.util
+import logging
+import os
+import socket
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+for route in ("SSE", "MESSAGES", "MCP"):
+    os.environ[f"{route}_RATE_LIMIT"] = "1e9"
+    os.environ[f"{route}_RATE_BURST"] = "1e9"
+
+import uvicorn
+from mcp import ClientSession
+from mcp.client.sse import sse_client
+from mcp.client.streamable_http import streamablehttp_client
+
+HEADERS = {"x-api-key": "secretkey"}
+
+
+def load_server():
+    spec = importlib.util.spec_from_file_location(
+        "api_key_server", os.path.join(ROOT, "API-Key-Based-Authentication", "server.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def start_server(app):
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    return server, thread, f"http://127.0.0.1:{port}"
+
+
+async def drive(session, calls, concurrency):
+    await session.initialize()
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def call():
+        async with semaphore:
+            start = time.perf_counter()
+            await session.call_tool("TimeTool", {"input_timezone": "UTC"})
+            latencies.append(time.perf_counter() - start)
+
+    await call()  # warm up
+    latencies.clear()
+    start = time.perf_counter()
+    await asyncio.gather(*(call() for _ in range(calls)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "calls_per_sec": calls / elapsed,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p99_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000,
+    }
+
+
+async def bench_sse(base_url, calls, concurrency):
+    async with sse_client(url=f"{base_url}/sse", headers=HEADERS) as (read, write):
+        async with ClientSession(read, write) as session:
+            return await drive(session, calls, concurrency)
+
+
+async def bench_streamable_http(base_url, calls, concurrency):
+    async with streamablehttp_client(url=f"{base_url}/mcp", headers=HEADERS) as (read, write, _):
+        async with ClientSession(read, write) as session:
+            return await drive(session, calls, concurrency)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+
+    server_module = load_server()
+    # Every request is logged at INFO; keep log output out of the timings
+    logging.disable(logging.INFO)
+    server, thread, base_url = start_server(server_module.app)
+    try:
+        print(f"{'transport':<18}{'calls/s':>10}{'p50 ms':>10}{'p99 ms':>10}")
+        for name, bench in (("sse", bench_sse), ("streamable-http", bench_streamable_http)):
+            result = asyncio.run(bench(base_url, args.calls, args.concurrency))
+            print(f"{name:<18}{result['calls_per_sec']:>10.0f}{result['p50_ms']:>10.2f}{result['p99_ms']:>10.2f}")
+    finally:
+        server.should_exit = True
+        thread.join()
+
+
+if __name__ == "__main__":
+    main()
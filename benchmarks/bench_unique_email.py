@@ -0,0 +1,110 @@
+"""Bulk inserts with a duplicate-email check: scanning every record versus UniqueIndex.
+
+Mirrors add_employee_record's insert path (duplicate check, then storing
+an EmployeeRecord from bench_serialization) for ``--records`` new
+employees. The scan is quadratic, so it runs on ``--scan-records`` and its
+time for the full count is extrapolated. A final check runs concurrent
+inserts that await between validation and the duplicate check, as tool
+calls can, and verifies each email is taken exactly once.
+
+    python benchmarks/bench_unique_email.py --records 1000000 --scan-records 10000
+"""
+import argparse
+import asyncio
+import datetime
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from mcp_common.indexes import UniqueIndex
+from bench_serialization import EmployeeRecord, EmploymentStatus
+
+HIRED = datetime.datetime(2022, 3, 15)
+
+
+def new_record(employee_id, email):
+    return EmployeeRecord(employee_id=employee_id, first_name="John", last_name="Smith", email=email,
+                          department="Engineering", position="Engineer", hire_date=HIRED, salary=95000.0,
+                          employment_status=EmploymentStatus.ACTIVE, manager_id=None, notes="")
+
+
+def insert_scan(records, employee_id, email):
+    # The check add_employee_record ran before
+    for employee in records.values():
+        if employee.email.lower() == email.lower():
+            return False
+    records[employee_id] = new_record(employee_id, email.strip())
+    return True
+
+
+def insert_indexed(records, emails, employee_id, email):
+    if not emails.claim(email, employee_id):
+        return False
+    records[employee_id] = new_record(employee_id, email.strip())
+    return True
+
+
+def emails_for(count):
+    # Every tenth address repeats the one nine before it in upper case, to exercise rejections
+    return [f"JOHN.SMITH{i - 9}@COMPANY.COM" if i % 10 == 9 else f"john.smith{i}@company.com"
+            for i in range(count)]
+
+
+async def concurrent_check(tasks, distinct):
+    records = {}
+    emails = UniqueIndex("email")
+
+    async def add(i):
+        employee_id = f"EMP-{i:07d}"
+        email = f"user{i % distinct}@company.com"
+        await asyncio.sleep(0)  # validation and other awaits before the check
+        added = insert_indexed(records, emails, employee_id, email)
+        await asyncio.sleep(0)
+        return added
+
+    added = await asyncio.gather(*(add(i) for i in range(tasks)))
+    assert sum(added) == distinct == len(records) == len(emails), (sum(added), len(records))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=1_000_000)
+    parser.add_argument("--scan-records", type=int, default=10_000)
+    args = parser.parse_args()
+
+    results = []
+    emails = emails_for(args.scan_records)
+    records = {}
+    start = time.perf_counter()
+    for i, email in enumerate(emails):
+        insert_scan(records, f"EMP-{i:07d}", email)
+    scan_time = time.perf_counter() - start
+    # n inserts each scanning on average n/2 records: time grows with n squared
+    results.append(("scan", args.scan_records, scan_time, scan_time * (args.records / args.scan_records) ** 2))
+    scanned = len(records)
+
+    emails = emails_for(args.records)
+    records = {}
+    index = UniqueIndex("email")
+    start = time.perf_counter()
+    for i, email in enumerate(emails):
+        insert_indexed(records, index, f"EMP-{i:07d}", email)
+    index_time = time.perf_counter() - start
+    results.append(("unique-index", args.records, index_time, index_time))
+    assert len(records) == len(index) == args.records - args.records // 10
+    assert scanned == args.scan_records - args.scan_records // 10
+
+    asyncio.run(concurrent_check(tasks=10_000, distinct=1_000))
+
+    print(f"{'path':<14}{'inserts':>10}{'seconds':>10}{'us/insert':>11}{f'est. {args.records} s':>18}")
+    for name, count, seconds, projected in results:
+        print(f"{name:<14}{count:>10}{seconds:>10.2f}{seconds / count * 1e6:>11.2f}{projected:>18.1f}")
+    print("concurrent inserts: each email taken exactly once")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""weather_tool lookups: blocking requests.get per call versus the pooled, cached WeatherClient.
+
+Starts benchmarks/mock_weather_server.py in-process on a free port and
+looks up a batch of cities (with repeats, as agents ask about the same
+places) with bounded concurrency, the way concurrent sessions would:
+
+- requests: what the tool did before, ``requests.get`` on the event loop
+  with no connection reuse, so lookups run one after another
+- weather-client: ``WeatherClient.current`` with pooling, the TTL cache
+  and coalescing; the cache starts empty
+
+    python benchmarks/bench_weather.py --lookups 500 --cities 50 --concurrency 32
+"""
+import argparse
+import asyncio
+import logging
+import os
+import socket
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import requests
+import uvicorn
+
+from mcp_common.weather import WeatherClient
+import mock_weather_server
+
+
+def start_server(app):
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    return server, thread, f"http://127.0.0.1:{port}/data/2.5"
+
+
+def blocking_lookup(base_url):
+    async def lookup(city):
+        # The old tool was a sync function, run by FastMCP on the event loop
+        return requests.get(f"{base_url}/weather?q={city}&appid=None&units=metric").json()
+
+    return lookup, None
+
+
+def client_lookup(base_url):
+    client = WeatherClient(base_url=base_url)
+    return client.current, client
+
+
+async def drive(factory, base_url, cities, concurrency):
+    lookup, client = factory(base_url)
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(city):
+        async with semaphore:
+            start = time.perf_counter()
+            data = await lookup(city)
+            latencies.append(time.perf_counter() - start)
+            assert data["name"] == city, data
+
+    try:
+        start = time.perf_counter()
+        await asyncio.gather(*(one(city) for city in cities))
+        elapsed = time.perf_counter() - start
+    finally:
+        if client is not None:
+            await client.aclose()
+    latencies.sort()
+    return {
+        "lookups_per_sec": len(cities) / elapsed,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p99_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lookups", type=int, default=500)
+    parser.add_argument("--cities", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--latency", type=float, default=0.05, help="mock upstream latency in seconds")
+    args = parser.parse_args()
+
+    mock_weather_server.MOCK_WEATHER_LATENCY = args.latency
+    cities = [f"City{i % args.cities}" for i in range(args.lookups)]
+    logging.disable(logging.INFO)
+    server, thread, base_url = start_server(mock_weather_server.app)
+    try:
+        print(f"{'path':<16}{'lookups/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'upstream':>10}")
+        for name, factory in (("requests", blocking_lookup), ("weather-client", client_lookup)):
+            before = mock_weather_server.requests_served["weather"]
+            result = asyncio.run(drive(factory, base_url, cities, args.concurrency))
+            upstream = mock_weather_server.requests_served["weather"] - before
+            print(f"{name:<16}{result['lookups_per_sec']:>10.1f}{result['p50_ms']:>10.2f}"
+                  f"{result['p99_ms']:>10.2f}{upstream:>10}")
+    finally:
+        server.should_exit = True
+        thread.join()
+
+
+if __name__ == "__main__":
+    main()
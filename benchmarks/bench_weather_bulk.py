@@ -0,0 +1,78 @@
+"""Weather for many cities at once: one lookup per city versus WeatherClient.current_many.
+
+Uses benchmarks/mock_weather_server.py in-process. Each round asks for the
+same set of cities with the cache expired (``ttl=0``), as an agent asking
+about its cities again later would, after a first round that learns their
+city ids:
+
+- per-city: ``current`` for every city, all at once
+- bulk: ``current_many``, group requests of up to 20 known ids with
+  bounded concurrency
+
+    python benchmarks/bench_weather_bulk.py --cities 60 --rounds 5
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from mcp_common.weather import WeatherClient
+from bench_weather import start_server
+import mock_weather_server
+
+
+async def per_city(client, cities, concurrency):
+    return await asyncio.gather(*(client.current(city) for city in cities))
+
+
+async def bulk(client, cities, concurrency):
+    results = await client.current_many(cities, concurrency=concurrency)
+    return list(results.values())
+
+
+async def drive(lookup, base_url, cities, rounds, concurrency):
+    client = WeatherClient(base_url=base_url, ttl=0)
+    try:
+        # Learn the city ids, as earlier single lookups would have
+        await per_city(client, cities, concurrency)
+        before = client.upstream_requests
+        start = time.perf_counter()
+        for _ in range(rounds):
+            results = await lookup(client, cities, concurrency)
+            assert all(isinstance(data, dict) for data in results)
+        elapsed = time.perf_counter() - start
+    finally:
+        await client.aclose()
+    return {"ms_per_round": elapsed / rounds * 1000, "upstream_per_round": (client.upstream_requests - before) / rounds}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cities", type=int, default=60)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.05, help="mock upstream latency in seconds")
+    args = parser.parse_args()
+
+    mock_weather_server.MOCK_WEATHER_LATENCY = args.latency
+    cities = [f"City{i}" for i in range(args.cities)]
+    logging.disable(logging.INFO)
+    server, thread, base_url = start_server(mock_weather_server.app)
+    try:
+        print(f"{'path':<12}{'ms/round':>10}{'upstream/round':>16}")
+        for name, lookup in (("per-city", per_city), ("bulk", bulk)):
+            result = asyncio.run(drive(lookup, base_url, cities, args.rounds, args.concurrency))
+            print(f"{name:<12}{result['ms_per_round']:>10.1f}{result['upstream_per_round']:>16.1f}")
+    finally:
+        server.should_exit = True
+        thread.join()
+
+
+if __name__ == "__main__":
+    main()
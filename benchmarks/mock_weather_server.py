@@ -0,0 +1,74 @@
+"""Offline stand-in for OpenWeatherMap's current-weather API.
+
+Serves ``GET /data/2.5/weather?q=<city>`` with the fields weather_tool
+reads, deterministic per city, after MOCK_WEATHER_LATENCY seconds. Cities
+starting with "Nowhere" get OpenWeatherMap's 404 body.
+``GET /data/2.5/group?id=<id>,...`` answers up to 20 city ids handed out
+by earlier lookups, like OpenWeatherMap's group endpoint. ``GET /stats``
+reports how many upstream requests were served, to check caching and
+coalescing.
+
+    python benchmarks/mock_weather_server.py
+    OPENWEATHERMAP_URL=http://127.0.0.1:8300/data/2.5 python API-Key-Based-Authentication/server.py
+"""
+import asyncio
+import hashlib
+import os
+from collections import Counter
+
+import uvicorn
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+
+MOCK_WEATHER_PORT = int(os.getenv("MOCK_WEATHER_PORT", "8300"))
+MOCK_WEATHER_LATENCY = float(os.getenv("MOCK_WEATHER_LATENCY", "0.05"))
+
+DESCRIPTIONS = ["clear sky", "few clouds", "scattered clouds", "light rain", "mist", "haze"]
+
+app = FastAPI()
+requests_served = Counter()
+# City ids handed out so far, for the group endpoint
+cities_by_id = {}
+
+
+def city_weather(city: str):
+    digest = hashlib.sha256(city.casefold().encode()).digest()
+    return {
+        "coord": {"lon": 0.0, "lat": 0.0},
+        "weather": [{"id": 800, "main": "Clear", "description": DESCRIPTIONS[digest[0] % len(DESCRIPTIONS)]}],
+        "main": {"temp": round(-10 + digest[1] / 255 * 50, 1), "humidity": digest[2] % 100},
+        "id": int.from_bytes(digest[:3], "big"),
+        "name": city,
+        "cod": 200,
+    }
+
+
+@app.get("/data/2.5/weather")
+async def weather(q: str, appid: str = None, units: str = "metric"):
+    requests_served["weather"] += 1
+    await asyncio.sleep(MOCK_WEATHER_LATENCY)
+    if q.casefold().startswith("nowhere"):
+        return JSONResponse({"cod": "404", "message": "city not found"}, status_code=404)
+    data = city_weather(q)
+    cities_by_id[data["id"]] = q
+    return data
+
+
+@app.get("/data/2.5/group")
+async def group(id: str, appid: str = None, units: str = "metric"):
+    requests_served["group"] += 1
+    await asyncio.sleep(MOCK_WEATHER_LATENCY)
+    ids = [int(city_id) for city_id in id.split(",") if city_id]
+    if len(ids) > 20:
+        return JSONResponse({"cod": "400", "message": "Too many cities"}, status_code=400)
+    found = [city_weather(cities_by_id[city_id]) for city_id in ids if city_id in cities_by_id]
+    return {"cnt": len(found), "list": found}
+
+
+@app.get("/stats")
+async def stats():
+    return dict(requests_served)
+
+
+if __name__ == "__main__":
+    uvicorn.run(app, host="127.0.0.1", port=MOCK_WEATHER_PORT)
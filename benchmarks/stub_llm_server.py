@@ -0,0 +1,101 @@
+"""Offline stand-in for the OpenAI chat completions API.
+
+Answers ``POST /v1/chat/completions``, streamed or not, with the tool-call
+JSON the clients' prompt asks for, followed by a sentence of explanation as
+chatty models tend to add. The tool and arguments are picked from the
+user's question with a few keyword rules that cover the demo queries. Text
+is produced a few characters at a time, STUB_LLM_TOKEN_DELAY seconds apart,
+to mimic generation speed.
+
+    python benchmarks/stub_llm_server.py
+    OPENAI_BASE_URL=http://127.0.0.1:8200/v1 OPENAI_API_KEY=stub python API-Key-Based-Authentication/client.py
+"""
+import asyncio
+import json
+import os
+import re
+import time
+import uuid
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+STUB_LLM_PORT = int(os.getenv("STUB_LLM_PORT", "8200"))
+STUB_LLM_TOKEN_DELAY = float(os.getenv("STUB_LLM_TOKEN_DELAY", "0.01"))
+# Characters per streamed chunk, roughly one token
+CHUNK_SIZE = 4
+
+TIMEZONES = {
+    "bengaluru": "Asia/Kolkata",
+    "bangalore": "Asia/Kolkata",
+    "mumbai": "Asia/Kolkata",
+    "dubai": "Asia/Dubai",
+    "london": "Europe/London",
+    "new york": "America/New_York",
+    "tokyo": "Asia/Tokyo",
+}
+
+app = FastAPI()
+
+
+def answer(prompt: str) -> str:
+    match = re.search(r"User's Question: (.*)", prompt)
+    question = match.group(1).strip() if match else prompt
+    city_match = re.search(r"\bin ([A-Z][\w ]*?)\s*(?:\?|$|right now)", question)
+    city = city_match.group(1).strip() if city_match else "London"
+    lowered = question.lower()
+    if "weather" in lowered:
+        call = {"tool": "weather_tool", "arguments": {"location": city}}
+    elif "time" in lowered:
+        call = {"tool": "TimeTool", "arguments": {"input_timezone": TIMEZONES.get(city.lower(), "UTC")}}
+    else:
+        return "I can only help with the time or the weather."
+    return (json.dumps(call, indent=4)
+            + f"\n\nI chose {call['tool']} because the question asks about {city}, "
+              "and its arguments match the tool's input schema.")
+
+
+def chunk(completion_id, model, delta, finish_reason=None):
+    return {
+        "id": completion_id,
+        "object": "chat.completion.chunk",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+    }
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    model = body.get("model", "stub")
+    content = answer(body["messages"][-1]["content"])
+    pieces = [content[i:i + CHUNK_SIZE] for i in range(0, len(content), CHUNK_SIZE)]
+    completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+
+    if not body.get("stream"):
+        await asyncio.sleep(STUB_LLM_TOKEN_DELAY * len(pieces))
+        return JSONResponse({
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content},
+                         "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": 0, "completion_tokens": len(pieces), "total_tokens": len(pieces)},
+        })
+
+    async def events():
+        yield f"data: {json.dumps(chunk(completion_id, model, {'role': 'assistant', 'content': ''}))}\n\n"
+        for piece in pieces:
+            await asyncio.sleep(STUB_LLM_TOKEN_DELAY)
+            yield f"data: {json.dumps(chunk(completion_id, model, {'content': piece}))}\n\n"
+        yield f"data: {json.dumps(chunk(completion_id, model, {}, 'stop'))}\n\n"
+        yield "data: [DONE]\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+if __name__ == "__main__":
+    uvicorn.run(app, host="127.0.0.1", port=STUB_LLM_PORT)
@@ -0,0 +1 @@
+"""Helpers shared by the API-key and JWT demo servers and clients."""
@@ -0,0 +1,208 @@
+"""Pluggable request authenticators for the demo servers.
+
+An ``AuthenticatorRegistry`` maps the scheme of the ``Authorization`` header
+(``Basic``/``Bearer``) straight to its handler and falls back to the
+``x-api-key`` header, so picking a handler is a single dictionary lookup.
+"""
+import base64
+import binascii
+import hashlib
+import hmac
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import jwt
+
+from mcp_common.metrics import LatencyRecorder
+from mcp_common.token_cache import VerifiedTokenCache
+
+
+class AuthError(Exception):
+    def __init__(self, detail: str = "Unauthorized"):
+        super().__init__(detail)
+        self.detail = detail
+
+
+@dataclass
+class Principal:
+    scheme: str
+    subject: str
+
+
+def hash_secret(secret: str) -> str:
+    # API keys and demo passwords are high-entropy random strings, so a single
+    # SHA-256 is enough to keep them out of memory and config files.
+    return hashlib.sha256(secret.encode()).hexdigest()
+
+
+class BasicAuthenticator:
+    scheme = "basic"
+
+    def __init__(self, users: Dict[str, str]):
+        """``users`` maps a username to the ``hash_secret`` of its password."""
+        self.users = users
+
+    def authenticate(self, credentials: str) -> Optional[Principal]:
+        try:
+            username, _, password = base64.b64decode(credentials).decode().partition(":")
+        except (binascii.Error, UnicodeDecodeError):
+            return None
+        expected = self.users.get(username)
+        if expected and hmac.compare_digest(expected, hash_secret(password)):
+            return Principal(self.scheme, username)
+        return None
+
+
+class BearerAuthenticator:
+    scheme = "bearer"
+
+    def __init__(self, secret: str, algorithms=("HS256",), cache: Optional[VerifiedTokenCache] = None):
+        self.secret = secret
+        self.algorithms = list(algorithms)
+        self.cache = cache if cache is not None else VerifiedTokenCache()
+        self.cache.bind_key(secret)
+
+    def authenticate(self, credentials: str) -> Optional[Principal]:
+        payload = self.cache.get(credentials)
+        if payload is None:
+            try:
+                payload = jwt.decode(credentials, self.secret, algorithms=self.algorithms)
+            except jwt.InvalidTokenError:
+                raise AuthError("Invalid token")
+            self.cache.put(credentials, payload)
+        return Principal(self.scheme, str(payload.get("sub", "")))
+
+
+class ApiKeyStore:
+    """Hashed API keys loaded from a file and reloaded when the file changes.
+
+    Each non-empty line holds ``<sha256-hex> <client-id>``; lines starting with
+    ``#`` are comments. The file's mtime is checked at most once every
+    ``reload_interval`` seconds and a changed file is swapped in atomically.
+    """
+
+    def __init__(self, path: str, reload_interval: float = 1.0):
+        self.path = path
+        self.reload_interval = reload_interval
+        self._keys: Dict[str, str] = {}
+        self._mtime = None
+        self._next_check = 0.0
+        self._lock = threading.Lock()
+        self.reloads = 0
+        self._reload()
+
+    def __len__(self):
+        return len(self._keys)
+
+    def _reload(self):
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+        if mtime == self._mtime:
+            return
+        keys = {}
+        if mtime is not None:
+            with open(self.path, "r") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line or line.startswith("#"):
+                        continue
+                    key_hash, _, client_id = line.partition(" ")
+                    keys[key_hash.lower()] = client_id.strip() or key_hash[:8]
+        self._keys = keys
+        self._mtime = mtime
+        self.reloads += 1
+
+    def _maybe_reload(self):
+        now = time.monotonic()
+        if now < self._next_check:
+            return
+        with self._lock:
+            if now < self._next_check:
+                return
+            self._next_check = now + self.reload_interval
+            self._reload()
+
+    def lookup(self, api_key: str) -> Optional[str]:
+        self._maybe_reload()
+        return self._keys.get(hash_secret(api_key))
+
+
+class ApiKeyAuthenticator:
+    scheme = "api-key"
+
+    def __init__(self, store: ApiKeyStore):
+        self.store = store
+
+    def authenticate(self, credentials: str) -> Optional[Principal]:
+        client_id = self.store.lookup(credentials)
+        if client_id is None:
+            return None
+        return Principal(self.scheme, client_id)
+
+
+class AuthenticatorRegistry:
+    def __init__(self, api_key_header: str = "x-api-key"):
+        self.api_key_header = api_key_header
+        self._by_scheme = {}
+        self._api_key = None
+        self._latency: Dict[str, LatencyRecorder] = {}
+
+    def register(self, authenticator) -> None:
+        if authenticator.scheme == ApiKeyAuthenticator.scheme:
+            self._api_key = authenticator
+        else:
+            self._by_scheme[authenticator.scheme] = authenticator
+        self._latency[authenticator.scheme] = LatencyRecorder()
+
+    def _run(self, authenticator, credentials: str) -> Optional[Principal]:
+        start = time.perf_counter()
+        try:
+            return authenticator.authenticate(credentials)
+        finally:
+            self._latency[authenticator.scheme].record(time.perf_counter() - start)
+
+    def authenticate(self, headers) -> Principal:
+        """Return the authenticated principal or raise ``AuthError``."""
+        principal = self._authenticate(headers, record=True)
+        if principal is None:
+            raise AuthError("Unauthorized")
+        return principal
+
+    def identify(self, headers) -> Optional[Principal]:
+        """``authenticate`` without recording latency; ``None`` instead of ``AuthError``.
+
+        For telling clients apart on requests that are not themselves
+        authenticated, such as rate limiting /messages/ posts.
+        """
+        return self._authenticate(headers, record=False)
+
+    def _authenticate(self, headers, record: bool) -> Optional[Principal]:
+        run = self._run if record else (lambda authenticator, credentials: authenticator.authenticate(credentials))
+        scheme, _, credentials = headers.get("authorization", "").partition(" ")
+        authenticator = self._by_scheme.get(scheme.lower())
+        if authenticator is not None:
+            principal = run(authenticator, credentials)
+            if principal is not None:
+                return principal
+        api_key = headers.get(self.api_key_header)
+        if api_key and self._api_key is not None:
+            principal = run(self._api_key, api_key)
+            if principal is not None:
+                return principal
+        return None
+
+    def stats(self) -> Dict:
+        return {scheme: recorder.snapshot() for scheme, recorder in self._latency.items()}
+
+
+if __name__ == "__main__":
+    import sys
+
+    # Print api_keys.txt lines for the keys given on the command line.
+    for key in sys.argv[1:]:
+        print(hash_secret(key), "client")
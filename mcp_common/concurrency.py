@@ -0,0 +1,23 @@
+"""Bounded concurrent map for pipelining queries over one MCP session."""
+import asyncio
+from typing import Awaitable, Callable, Iterable, List, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+async def map_bounded(func: Callable[[T], Awaitable[R]], items: Iterable[T], limit: int,
+                      return_exceptions: bool = False) -> List[R]:
+    """Run ``func`` over ``items`` with at most ``limit`` calls in flight.
+
+    Results come back in input order. As with ``asyncio.gather``, the first
+    error is raised unless ``return_exceptions`` is set, in which case it
+    takes that item's place in the results.
+    """
+    semaphore = asyncio.Semaphore(max(1, limit))
+
+    async def run(item: T) -> R:
+        async with semaphore:
+            return await func(item)
+
+    return await asyncio.gather(*(run(item) for item in items), return_exceptions=return_exceptions)
@@ -0,0 +1,112 @@
+"""Bounded LRU cache of the LLM's tool decision per query, optionally kept on disk."""
+import hashlib
+import json
+import os
+import re
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+
+def normalize_query(query: str) -> str:
+    """Case, width, spacing and trailing punctuation do not change the decision."""
+    query = unicodedata.normalize("NFKC", query).casefold()
+    return re.sub(r"\s+", " ", query).strip().rstrip("?!. ")
+
+
+class DecisionCache:
+    """Remembers which tool and arguments the LLM chose for a query.
+
+    Entries are keyed by the normalized query and the hash of the tool
+    manifest it was asked against, so a changed tool list never serves an
+    old decision. Each entry lives ``ttl`` seconds and the least recently
+    used one is dropped beyond ``max_entries``. With ``path`` set the cache
+    is loaded from that JSON file on creation and written back by ``save``.
+    Used from the event loop only, so there is no locking.
+    """
+
+    def __init__(self, max_entries: int = 1000, ttl: float = 24 * 3600, path: Optional[str] = None,
+                 clock=time.time):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.path = path
+        # Wall-clock time: expiries must stay meaningful across runs
+        self._clock = clock
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if path:
+            self.load()
+
+    @staticmethod
+    def key(query: str, manifest_hash: str) -> str:
+        return hashlib.sha256(f"{manifest_hash}\0{normalize_query(query)}".encode()).hexdigest()
+
+    def get(self, query: str, manifest_hash: str) -> Optional[Dict[str, Any]]:
+        """Return the cached ``{"tool", "arguments"}`` decision or ``None`` on a miss."""
+        key = self.key(query, manifest_hash)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires, decision = entry
+        if expires <= self._clock():
+            del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return decision
+
+    def put(self, query: str, manifest_hash: str, decision: Dict[str, Any]) -> None:
+        if self.max_entries <= 0:
+            return
+        key = self.key(query, manifest_hash)
+        self._entries[key] = (self._clock() + self.ttl, {"tool": decision["tool"],
+                                                         "arguments": decision.get("arguments", {})})
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def load(self) -> None:
+        """Read unexpired entries from ``path``; a missing or unreadable file leaves the cache empty."""
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            return
+        now = self._clock()
+        # Stored least recently used first, which is the order to re-insert them in
+        for key, expires, decision in stored.get("entries", []):
+            if expires > now:
+                self._entries[key] = (expires, decision)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def save(self) -> None:
+        """Write the unexpired entries to ``path``, replacing the file atomically."""
+        if not self.path:
+            return
+        now = self._clock()
+        entries = [[key, expires, decision] for key, (expires, decision) in self._entries.items() if expires > now]
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"entries": entries}, f)
+        os.replace(tmp_path, self.path)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
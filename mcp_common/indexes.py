@@ -0,0 +1,107 @@
+"""Secondary indexes over the in-memory record stores of the RBAC tool servers.
+
+The stores are dicts from record id to dataclass. ``SecondaryIndex`` keeps,
+per indexed field, a map from value to the records holding it, so an
+equality filter is a dict lookup and several filters intersect their id sets,
+smallest first, instead of scanning every record. The tools that mutate a
+store tell the index (``add``, ``update``); the tools run on one event loop
+and never await between the two, so no locking is needed. ``UniqueIndex``
+enforces a unique field, such as an email address, without a scan.
+"""
+from typing import Any, Dict, Iterable, List, Optional
+
+
+class SecondaryIndex:
+    """Equality indexes on ``fields`` of the records in one store."""
+
+    def __init__(self, fields: Iterable[str], records: Dict[str, Any] = None):
+        self.fields = tuple(fields)
+        # field -> value -> {id: record}; holding the records saves a lookup
+        # in the (much larger) store per result
+        self._postings: Dict[str, Dict[Any, Dict[str, Any]]] = {field: {} for field in self.fields}
+        # Store order of each id, to return results in the order a scan would
+        self._order: Dict[str, int] = {}
+        # Fields whose id sets are no longer in store order after updates
+        self._reordered = set()
+        if records:
+            for record_id, record in records.items():
+                self.add(record_id, record)
+
+    def add(self, record_id: str, record: Any) -> None:
+        if record_id not in self._order:
+            self._order[record_id] = len(self._order)
+        for field in self.fields:
+            self._postings[field].setdefault(getattr(record, field), {})[record_id] = record
+
+    def update(self, record_id: str, field: str, old: Any, new: Any) -> None:
+        """Move ``record_id`` from ``old`` to ``new`` in the index on ``field``."""
+        if old == new:
+            return
+        postings = self._postings[field]
+        matches = postings.get(old)
+        if matches is None or record_id not in matches:
+            return
+        record = matches.pop(record_id)
+        if not matches:
+            del postings[old]
+        postings.setdefault(new, {})[record_id] = record
+        self._reordered.add(field)
+
+    def select(self, records: Dict[str, Any], **filters) -> List[Any]:
+        """The records of ``records`` matching every filter with a truthy value, in store order."""
+        active = [(field, value) for field, value in filters.items() if value]
+        if not active:
+            return list(records.values())
+        candidates = sorted(((self._postings[field].get(value, {}), field) for field, value in active),
+                            key=lambda candidate: len(candidate[0]))
+        (matches, field), others = candidates[0], [matches for matches, _ in candidates[1:]]
+        if len(others) == 1:
+            other = others[0]
+            matches = {record_id: record for record_id, record in matches.items() if record_id in other}
+        elif others:
+            matches = {record_id: record for record_id, record in matches.items()
+                       if all(record_id in other for other in others)}
+        # Results follow the order of the smallest set, which updates may have changed
+        if field in self._reordered and len(matches) > 1:
+            return [matches[record_id] for record_id in sorted(matches, key=self._order.__getitem__)]
+        return list(matches.values())
+
+
+def fold_case(value: str) -> str:
+    return value.strip().casefold()
+
+
+class UniqueIndex:
+    """Unique values of one field, e.g. emails, compared after ``normalize``.
+
+    ``claim`` checks and reserves a value in one step. It never awaits, so
+    of several concurrent tool calls adding the same value exactly one gets
+    it, whatever they await before or after.
+    """
+
+    def __init__(self, field: str, records: Dict[str, Any] = None, normalize=fold_case):
+        self.field = field
+        self.normalize = normalize
+        self._owners: Dict[str, str] = {}
+        if records:
+            for record_id, record in records.items():
+                self._owners.setdefault(normalize(getattr(record, field)), record_id)
+
+    def __len__(self) -> int:
+        return len(self._owners)
+
+    def __contains__(self, value: str) -> bool:
+        return self.normalize(value) in self._owners
+
+    def owner(self, value: str) -> Optional[str]:
+        """The id of the record holding ``value``, if any."""
+        return self._owners.get(self.normalize(value))
+
+    def claim(self, value: str, record_id: str) -> bool:
+        """Reserve ``value`` for ``record_id``; False if another record holds it."""
+        return self._owners.setdefault(self.normalize(value), record_id) == record_id
+
+    def release(self, value: str, record_id: str) -> None:
+        key = self.normalize(value)
+        if self._owners.get(key) == record_id:
+            del self._owners[key]
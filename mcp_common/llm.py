@@ -0,0 +1,162 @@
+"""Shared async LLM client that streams completions and returns the tool call early.
+
+The clients used to build a synchronous ``OpenAI()`` per query, with a new
+connection pool each time, and wait for the whole completion before parsing
+it. ``AsyncLLMClient`` is created once per process and keeps its HTTP
+connections open across queries. ``tool_call`` streams the completion
+through ``JSONObjectScanner`` and returns the first JSON object as soon as
+its closing brace arrives, so the MCP tool call can be sent while the model
+is still producing any text after it.
+
+``OPENAI_BASE_URL`` and ``OPENAI_API_KEY`` are read by the OpenAI SDK, e.g.
+``OPENAI_BASE_URL=http://127.0.0.1:8200/v1 OPENAI_API_KEY=stub`` to use
+``benchmarks/stub_llm_server.py`` offline.
+"""
+import asyncio
+import json
+import os
+from typing import Any, AsyncIterator, Dict, Optional, Set, Tuple
+
+import httpx
+from loguru import logger
+from openai import AsyncOpenAI
+
+LLM_MODEL = os.getenv("LLM_MODEL", "gpt-4o-mini")
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "16"))
+SYSTEM_PROMPT = "You are an intelligent Assistant. You will execute tasks as instructed"
+
+
+class JSONObjectScanner:
+    """Finds the first complete top-level JSON object in text fed in pieces.
+
+    Text before the opening brace (prose, a code fence) is skipped. Braces
+    inside strings, including escaped quotes, are not counted.
+    """
+
+    def __init__(self):
+        self._buffer = []
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self.result: Optional[str] = None
+
+    def feed(self, text: str) -> Optional[str]:
+        """Consume ``text``; return the object's source once its closing brace has been seen."""
+        if self.result is not None:
+            return self.result
+        start = 0
+        if self._depth == 0:
+            start = text.find("{")
+            if start < 0:
+                return None
+        for i in range(start, len(text)):
+            char = text[i]
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char == "{":
+                self._depth += 1
+            elif char == "}":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._buffer.append(text[start:i + 1])
+                    self.result = "".join(self._buffer)
+                    return self.result
+        self._buffer.append(text[start:])
+        return None
+
+
+class AsyncLLMClient:
+    """One pooled ``AsyncOpenAI`` client shared by all queries."""
+
+    def __init__(self, model: str = LLM_MODEL, system_prompt: str = SYSTEM_PROMPT,
+                 max_connections: int = LLM_MAX_CONNECTIONS, **client_kwargs):
+        self.model = model
+        self.system_prompt = system_prompt
+        self._http = httpx.AsyncClient(limits=httpx.Limits(max_connections=max_connections,
+                                                           max_keepalive_connections=max_connections),
+                                       timeout=httpx.Timeout(60.0, connect=5.0))
+        self._client = AsyncOpenAI(http_client=self._http, **client_kwargs)
+        # Streams still being read after their tool call was returned
+        self._draining: Set[asyncio.Task] = set()
+
+    async def __aenter__(self) -> "AsyncLLMClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    def _messages(self, message: str):
+        return [
+            {"role": "system", "content": self.system_prompt},
+            {"role": "user", "content": message},
+        ]
+
+    async def complete(self, message: str) -> str:
+        completion = await self._client.chat.completions.create(model=self.model, messages=self._messages(message))
+        return completion.choices[0].message.content
+
+    async def stream(self, message: str) -> AsyncIterator[str]:
+        """Yield the completion's text as it is generated."""
+        stream = await self._client.chat.completions.create(
+            model=self.model, messages=self._messages(message), stream=True)
+        try:
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        finally:
+            await stream.close()
+
+    async def tool_call(self, message: str) -> Tuple[Optional[Dict[str, Any]], str]:
+        """Stream a completion and return ``(tool_call, text)`` as soon as a JSON object closes.
+
+        ``tool_call`` is the parsed object, or None if the completion held no
+        JSON object (the model replied directly); ``text`` is what was read
+        up to that point.
+        """
+        scanner = JSONObjectScanner()
+        received = []
+        stream = await self._client.chat.completions.create(
+            model=self.model, messages=self._messages(message), stream=True)
+        try:
+            async for chunk in stream:
+                if not chunk.choices or not chunk.choices[0].delta.content:
+                    continue
+                received.append(chunk.choices[0].delta.content)
+                source = scanner.feed(chunk.choices[0].delta.content)
+                if source is not None:
+                    break
+        except BaseException:
+            await stream.close()
+            raise
+        if scanner.result is None:
+            await stream.close()
+            return None, "".join(received)
+        # Let the rest of the completion arrive in the background so the
+        # connection goes back to the pool instead of being torn down
+        task = asyncio.create_task(self._drain(stream))
+        self._draining.add(task)
+        task.add_done_callback(self._draining.discard)
+        return json.loads(scanner.result), "".join(received)
+
+    async def _drain(self, stream) -> None:
+        try:
+            async for _ in stream:
+                pass
+        except Exception as e:
+            logger.debug(f"Discarded the rest of a completion: {e!r}")
+        finally:
+            await stream.close()
+
+    async def close(self) -> None:
+        for task in list(self._draining):
+            task.cancel()
+        await asyncio.gather(*self._draining, return_exceptions=True)
+        await self._client.close()
+        await self._http.aclose()
@@ -0,0 +1,33 @@
+"""A server's tool list with its prompt rendering and content hash, built once per change.
+
+The clients describe the tools to the LLM on every query. ``ToolManifest``
+renders that description once, and its ``hash`` identifies the exact tool
+set, e.g. to key caches that must not outlive a change of tools.
+"""
+import hashlib
+import json
+from functools import cached_property
+
+from mcp.types import ListToolsResult
+
+
+class ToolManifest:
+    def __init__(self, tools: ListToolsResult):
+        self.tools = tools
+
+    @cached_property
+    def hash(self) -> str:
+        canonical = [
+            {"name": tool.name, "description": tool.description, "inputSchema": tool.inputSchema}
+            for tool in sorted(self.tools.tools, key=lambda tool: tool.name)
+        ]
+        return hashlib.sha256(json.dumps(canonical, sort_keys=True).encode()).hexdigest()
+
+    @cached_property
+    def description(self) -> str:
+        """One ``name: description, schema`` line per tool, as used in the tool-selection prompt."""
+        return "\n".join([f"{tool.name}: {tool.description}, {tool.inputSchema}" for tool in self.tools.tools])
+
+    @property
+    def names(self):
+        return [tool.name for tool in self.tools.tools]
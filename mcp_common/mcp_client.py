@@ -0,0 +1,209 @@
+"""Long-lived MCP client session over SSE that reconnects on failure.
+
+Opening an SSE connection, running ``initialize`` and listing tools costs
+several round trips. ``PersistentMCPClient`` pays that once and serves any
+number of tool calls over the same session. A background task owns the
+connection, so the streams are opened and closed in one task whatever task
+the calls come from. When a request fails because the connection dropped,
+the session is rebuilt; ``list_tools`` is then retried once, while a tool
+call is only retried with ``retry=True``, since the server may have run it
+before the connection dropped. The tool list is kept until the server
+announces that it changed.
+
+    async with PersistentMCPClient("http://localhost:8100/sse", headers={"x-api-key": "..."}) as client:
+        result = await client.call_tool("TimeTool", {"input_timezone": "UTC"}, retry=True)
+"""
+import asyncio
+from datetime import timedelta
+from typing import Any, Awaitable, Callable, Dict, Optional, Union
+
+import anyio
+import httpx
+from loguru import logger
+from mcp import ClientSession
+from mcp.client.sse import sse_client
+from mcp.shared.exceptions import McpError
+from mcp.types import CONNECTION_CLOSED, CallToolResult, ListToolsResult, ServerNotification, ToolListChangedNotification
+
+from mcp_common.manifest import ToolManifest
+
+HeadersProvider = Callable[[], Awaitable[Dict[str, str]]]
+
+# Errors meaning the session is gone, as opposed to a failing tool call
+_CONNECTION_ERRORS = (anyio.ClosedResourceError, anyio.BrokenResourceError, anyio.EndOfStream, httpx.HTTPError)
+
+
+def _is_connection_error(error: BaseException) -> bool:
+    if isinstance(error, McpError):
+        return error.error.code == CONNECTION_CLOSED
+    return isinstance(error, _CONNECTION_ERRORS)
+
+
+class PersistentMCPClient:
+    """One MCP session kept open across queries.
+
+    ``headers`` is a dict, or an async callable returning one that is called
+    on every (re)connect, e.g. to fetch a fresh bearer token.
+    """
+
+    def __init__(self, url: str, headers: Union[Dict[str, str], HeadersProvider, None] = None,
+                 request_timeout: float = 60.0, max_backoff: float = 10.0):
+        self.url = url
+        self.headers = headers
+        self.request_timeout = request_timeout
+        self.max_backoff = max_backoff
+        self.server_info = None
+        self.tools: Optional[ListToolsResult] = None
+        self._manifest: Optional[ToolManifest] = None
+        self.connects = 0
+        self._session: Optional[ClientSession] = None
+        self._ready = asyncio.Event()
+        self._disconnect = asyncio.Event()
+        self._closing = False
+        self._runner: Optional[asyncio.Task] = None
+        self._last_error: Optional[BaseException] = None
+
+    async def __aenter__(self) -> "PersistentMCPClient":
+        await self.connect()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def connect(self, timeout: float = 30.0) -> None:
+        """Start the connection task and wait for the first session."""
+        if self._runner is None:
+            self._runner = asyncio.create_task(self._run())
+        try:
+            await self._wait_ready(timeout)
+        except BaseException:
+            await self.close()
+            raise
+
+    async def _wait_ready(self, timeout: float) -> ClientSession:
+        ready = asyncio.ensure_future(self._ready.wait())
+        done, _ = await asyncio.wait({ready, self._runner}, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        if ready not in done:
+            ready.cancel()
+            raise ConnectionError(f"Could not connect to {self.url}: {self._last_error or 'timed out'}")
+        return self._session
+
+    async def _resolve_headers(self) -> Optional[Dict[str, str]]:
+        if callable(self.headers):
+            return await self.headers()
+        return self.headers
+
+    async def _run(self) -> None:
+        backoff = 0.5
+        while not self._closing:
+            try:
+                headers = await self._resolve_headers()
+                async with sse_client(url=self.url, headers=headers) as (in_stream, out_stream), \
+                        anyio.create_task_group() as tg:
+                    watched_writer, watched_stream = anyio.create_memory_object_stream(0)
+                    tg.start_soon(self._watch, in_stream, watched_writer)
+                    async with ClientSession(
+                        watched_stream, out_stream, read_timeout_seconds=timedelta(seconds=self.request_timeout),
+                        message_handler=self._on_message,
+                    ) as session:
+                        info = await session.initialize()
+                        self.server_info = info.serverInfo
+                        self.tools = await session.list_tools()
+                        self.connects += 1
+                        logger.info(f"Connected to {info.serverInfo.name} v{info.serverInfo.version}")
+                        backoff = 0.5
+                        self._session = session
+                        self._ready.set()
+                        await self._disconnect.wait()
+                    tg.cancel_scope.cancel()
+            except Exception as e:
+                # Task groups wrap the actual error
+                while len(getattr(e, "exceptions", ())) == 1:
+                    e = e.exceptions[0]
+                self._last_error = e
+                logger.warning(f"MCP connection to {self.url} failed: {e!r}")
+            finally:
+                self._session = None
+                self._ready.clear()
+                self._disconnect.clear()
+            if not self._closing:
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, self.max_backoff)
+
+    async def _on_message(self, message) -> None:
+        if isinstance(message, ServerNotification) and isinstance(message.root, ToolListChangedNotification):
+            logger.info(f"Tool list of {self.url} changed, refreshing on next use")
+            self.tools = None
+
+    async def _watch(self, in_stream, watched_writer) -> None:
+        # sse_client only logs a dropped event stream, and requests sent after
+        # that would wait for their timeout; notice the end of the stream instead
+        async with watched_writer:
+            async for message in in_stream:
+                await watched_writer.send(message)
+        if not self._closing:
+            logger.warning(f"MCP event stream from {self.url} ended, reconnecting")
+        self._session = None
+        self._ready.clear()
+        self._disconnect.set()
+
+    async def _get_session(self) -> ClientSession:
+        if self._runner is None:
+            raise RuntimeError("PersistentMCPClient is not connected, use 'async with' or connect()")
+        if self._session is not None:
+            return self._session
+        return await self._wait_ready(self.request_timeout)
+
+    def _reconnect(self, session: ClientSession) -> None:
+        # Several callers may notice the same dead session; only tear it down once
+        if self._session is session:
+            self._session = None
+            self._ready.clear()
+            self._disconnect.set()
+
+    async def _request(self, call: Callable[[ClientSession], Awaitable[Any]], retry: bool) -> Any:
+        session = await self._get_session()
+        try:
+            return await call(session)
+        except Exception as e:
+            if not _is_connection_error(e):
+                raise
+            logger.warning(f"MCP session lost ({e}), reconnecting")
+            self._reconnect(session)
+            if not retry:
+                raise
+        return await call(await self._get_session())
+
+    async def call_tool(self, name: str, arguments: Optional[Dict[str, Any]] = None,
+                        retry: bool = False) -> CallToolResult:
+        """Call a tool. Pass ``retry=True`` only for idempotent tools: a call
+        cut off by a dropped connection may already have run on the server."""
+        return await self._request(lambda session: session.call_tool(name, arguments=arguments), retry=retry)
+
+    async def list_tools(self, refresh: bool = False) -> ListToolsResult:
+        """The tools listed at connect time, or a fresh listing with ``refresh``."""
+        if refresh or self.tools is None:
+            self.tools = await self._request(lambda session: session.list_tools(), retry=True)
+        return self.tools
+
+    async def tool_manifest(self) -> ToolManifest:
+        """The current tool list with its rendered prompt description and hash."""
+        tools = await self.list_tools()
+        if self._manifest is None or self._manifest.tools is not tools:
+            manifest = ToolManifest(tools)
+            if self._manifest is None or manifest.hash != self._manifest.hash:
+                self._manifest = manifest
+            else:
+                # Same tools after a reconnect or a spurious notification: keep the rendered prompt
+                self._manifest.tools = tools
+        return self._manifest
+
+    async def close(self) -> None:
+        self._closing = True
+        self._disconnect.set()
+        if self._runner is not None:
+            runner, self._runner = self._runner, None
+            try:
+                await asyncio.wait_for(runner, timeout=5)
+            except (asyncio.TimeoutError, asyncio.CancelledError):
+                runner.cancel()
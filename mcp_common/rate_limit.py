@@ -0,0 +1,106 @@
+"""Per-client token-bucket rate limiting for the demo servers' Starlette apps."""
+import time
+from typing import Callable, Dict, Optional
+
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+
+class RateLimiter:
+    """Token buckets keyed by client.
+
+    Each client may make ``burst`` requests at once and then ``rate`` requests
+    per second. Buckets idle for longer than ``idle_seconds`` are full again and
+    are evicted, so memory tracks active clients only. The limiter is used from
+    the event loop thread only, so it needs no locking.
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None, idle_seconds: float = 300.0,
+                 clock=time.monotonic):
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self.idle_seconds = idle_seconds
+        self._clock = clock
+        self._buckets: Dict[str, list] = {}  # key -> [tokens, last refill time]
+        self._next_sweep = clock() + idle_seconds
+        self.allowed = 0
+        self.throttled = 0
+        self.evicted = 0
+
+    def acquire(self, key: str) -> float:
+        """Take one token for ``key``. Returns 0 if allowed, else seconds until a token is free."""
+        now = self._clock()
+        if now >= self._next_sweep:
+            self._evict_idle(now)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = [self.burst, now]
+        else:
+            bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+        if bucket[0] >= 1:
+            bucket[0] -= 1
+            self.allowed += 1
+            return 0.0
+        self.throttled += 1
+        return (1 - bucket[0]) / self.rate if self.rate > 0 else self.idle_seconds
+
+    def _evict_idle(self, now: float) -> None:
+        self._next_sweep = now + self.idle_seconds
+        idle = [key for key, (_, last) in self._buckets.items() if now - last >= self.idle_seconds]
+        for key in idle:
+            del self._buckets[key]
+        self.evicted += len(idle)
+
+    def stats(self) -> Dict:
+        return {
+            "rate": self.rate,
+            "burst": self.burst,
+            "clients": len(self._buckets),
+            "allowed": self.allowed,
+            "throttled": self.throttled,
+            "evicted": self.evicted,
+        }
+
+
+class RateLimitMiddleware:
+    """Rejects over-limit requests with 429 before they reach the MCP transport.
+
+    ``limits`` maps a path prefix to its limiter; ``identify`` returns the
+    client key for a request (API key, token subject, ...) or ``None``, in
+    which case the client's address is used.
+    """
+
+    def __init__(self, app: ASGIApp, limits: Dict[str, RateLimiter],
+                 identify: Callable[[Request], Optional[str]]):
+        self.app = app
+        self.limits = limits
+        self.identify = identify
+
+    def _limiter_for(self, path: str) -> Optional[RateLimiter]:
+        for prefix, limiter in self.limits.items():
+            if path.startswith(prefix):
+                return limiter
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        limiter = self._limiter_for(scope["path"]) if scope["type"] == "http" else None
+        if limiter is None:
+            return await self.app(scope, receive, send)
+        request = Request(scope)
+        try:
+            key = self.identify(request)
+        except Exception:
+            key = None
+        if key is None:
+            key = f"addr:{request.client.host if request.client else 'unknown'}"
+        retry_after = limiter.acquire(key)
+        if retry_after:
+            response = JSONResponse(
+                {"detail": "Too many requests"},
+                status_code=429,
+                headers={"Retry-After": str(max(1, round(retry_after)))},
+            )
+            return await response(scope, receive, send)
+        await self.app(scope, receive, send)
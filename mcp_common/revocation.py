@@ -0,0 +1,228 @@
+"""Deny-list of revoked token ids (``jti``) with constant-time checks.
+
+A Bloom filter sits in front of an exact ``jti -> exp`` dictionary: the vast
+majority of checks are for tokens that were never revoked and are answered by
+the filter alone, and a filter hit is confirmed against the dictionary so
+false positives never reject a valid token. Entries are dropped once their
+token has expired, since the signature check rejects it from then on anyway.
+"""
+import hashlib
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows; appends and compaction are then unsynchronized
+    fcntl = None
+
+
+@contextmanager
+def _locked_file(path: str):
+    """Open ``path`` for appending under an exclusive lock.
+
+    If a compaction replaced the file while we waited for the lock, the
+    replacement is opened instead, so no line goes to the orphaned file.
+    """
+    while True:
+        f = open(path, "a+b")
+        if fcntl is None:
+            break
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            if os.fstat(f.fileno()).st_ino == os.stat(path).st_ino:
+                break
+        except FileNotFoundError:
+            pass
+        f.close()
+    try:
+        yield f
+    finally:
+        # Closing releases the lock
+        f.close()
+
+
+def append_revocation(path: str, jti: str, exp: float) -> None:
+    """Append a ``<jti> <exp>`` line to a revocation file shared with running servers."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with _locked_file(path) as f:
+        f.write(f"{jti} {int(exp)}\n".encode())
+
+
+class BloomFilter:
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        self.capacity = max(1, capacity)
+        self.size = max(8, math.ceil(-self.capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / self.capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+class RevocationStore:
+    """Revoked ``jti`` values, optionally shared between processes through a file.
+
+    With ``path`` set, each line of the file is ``<jti> <exp>`` and ``revoke``
+    appends to it. Lines appended since the last read are picked up at most
+    every ``reload_interval`` seconds; only the new bytes are parsed. Expired
+    entries are purged every ``purge_interval`` seconds, the filter is rebuilt
+    from what is left, and the file is rewritten without the expired lines so
+    it does not grow forever. Other processes notice the rewrite (a new
+    inode) and read the compacted file afresh.
+    """
+
+    def __init__(self, capacity: int = 100_000, error_rate: float = 0.001, purge_interval: float = 60.0,
+                 path: Optional[str] = None, reload_interval: float = 1.0, clock=time.time):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.purge_interval = purge_interval
+        self.path = path
+        self.reload_interval = reload_interval
+        self._clock = clock
+        self._revoked: Dict[str, float] = {}
+        self._filter = BloomFilter(capacity, error_rate)
+        self._lock = threading.Lock()
+        # Which file was read (device, inode), up to where, and how many of its lines are expired
+        self._file_id = None
+        self._file_offset = 0
+        self._dead_lines = 0
+        self._next_reload = 0.0
+        self._next_purge = time.monotonic() + purge_interval
+        self.filter_hits = 0
+        self.false_positives = 0
+        if path:
+            self._reload_file()
+
+    def __len__(self):
+        return len(self._revoked)
+
+    def revoke(self, jti: str, exp: float) -> None:
+        """Deny ``jti`` until ``exp`` (the token's own expiry)."""
+        if exp <= self._clock():
+            return
+        with self._lock:
+            self._add(jti, exp)
+        if self.path:
+            append_revocation(self.path, jti, exp)
+
+    def _add(self, jti: str, exp: float) -> None:
+        self._revoked[jti] = max(exp, self._revoked.get(jti, 0))
+        self._filter.add(jti)
+        if len(self._revoked) > self._filter.capacity:
+            self._rebuild_filter()
+
+    def _rebuild_filter(self) -> None:
+        bloom = BloomFilter(max(self.capacity, 2 * len(self._revoked)), self.error_rate)
+        for jti in self._revoked:
+            bloom.add(jti)
+        self._filter = bloom
+
+    def is_revoked(self, jti: Optional[str]) -> bool:
+        self._maintain()
+        if not jti or jti not in self._filter:
+            return False
+        self.filter_hits += 1
+        exp = self._revoked.get(jti)
+        if exp is None or exp <= self._clock():
+            self.false_positives += 1
+            return False
+        return True
+
+    def _maintain(self) -> None:
+        now = time.monotonic()
+        if self.path and now >= self._next_reload:
+            self._next_reload = now + self.reload_interval
+            self._reload_file()
+        if now >= self._next_purge:
+            self._next_purge = now + self.purge_interval
+            self.purge()
+
+    def _reload_file(self) -> None:
+        try:
+            f = open(self.path, "rb")
+        except FileNotFoundError:
+            return
+        with f, self._lock:
+            self._read_new_lines(f)
+
+    def _read_new_lines(self, f) -> None:
+        # Called with self._lock held
+        st = os.fstat(f.fileno())
+        file_id = (st.st_dev, st.st_ino)
+        if file_id != self._file_id or st.st_size < self._file_offset:
+            # First read, or the file was compacted (here or by another process)
+            self._file_id, self._file_offset, self._dead_lines = file_id, 0, 0
+        if st.st_size == self._file_offset:
+            return
+        f.seek(self._file_offset)
+        data = f.read(st.st_size - self._file_offset)
+        # A line still being written is left for the next read
+        complete = data.rfind(b"\n") + 1
+        now = self._clock()
+        for line in data[:complete].decode().splitlines():
+            jti, _, exp = line.strip().partition(" ")
+            try:
+                exp = float(exp)
+            except ValueError:
+                self._dead_lines += 1
+                continue
+            if jti and exp > now:
+                self._add(jti, exp)
+            else:
+                self._dead_lines += 1
+        self._file_offset += complete
+
+    def purge(self) -> int:
+        """Drop entries whose token has expired. Returns how many were removed."""
+        now = self._clock()
+        with self._lock:
+            expired = [jti for jti, exp in self._revoked.items() if exp <= now]
+            for jti in expired:
+                del self._revoked[jti]
+            if expired:
+                self._rebuild_filter()
+            if self.path and (expired or self._dead_lines):
+                self._compact_file()
+        return len(expired)
+
+    def _compact_file(self) -> None:
+        # Called with self._lock held. Appends from every process wait on the
+        # file lock, so none is lost between reading and replacing the file.
+        try:
+            with _locked_file(self.path) as f:
+                self._read_new_lines(f)
+                now = self._clock()
+                tmp_path = f"{self.path}.tmp"
+                with open(tmp_path, "wb") as out:
+                    out.write("".join(f"{jti} {int(exp)}\n" for jti, exp in self._revoked.items()
+                                      if exp > now).encode())
+                os.replace(tmp_path, self.path)
+                st = os.stat(self.path)
+        except OSError:
+            # Keep serving from memory; the next purge tries again
+            return
+        self._file_id, self._file_offset, self._dead_lines = (st.st_dev, st.st_ino), st.st_size, 0
+
+    def stats(self) -> Dict:
+        return {
+            "revoked": len(self._revoked),
+            "filter_bits": self._filter.size,
+            "filter_hits": self.filter_hits,
+            "false_positives": self.false_positives,
+        }
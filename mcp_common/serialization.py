@@ -0,0 +1,68 @@
+"""One-pass JSON encoding for tool results holding dataclasses.
+
+Tools can return their dataclass records as they are instead of copying
+them into dicts with ``dataclasses.asdict``; ``datetime`` values become ISO
+8601 strings and ``Enum`` members their value. orjson is used when it is
+installed, the standard library otherwise.
+
+Pass ``tool_serializer`` to ``FastMCP`` so tool results are encoded with it.
+For a plain dict FastMCP also builds the structured content with
+``pydantic_core.to_jsonable_python``, a second walk over every record that
+costs several times the encoding; tools returning many records return an
+``EncodedToolResult`` instead, which encodes once and parses the structured
+content back from that text.
+"""
+import dataclasses
+import datetime
+import enum
+import json
+from typing import Any
+
+from fastmcp.tools.tool import ToolResult
+from mcp.types import TextContent
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _default(obj: Any) -> Any:
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        # Shallow: nested values are encoded by the encoder itself
+        return {field.name: getattr(obj, field.name) for field in dataclasses.fields(obj)}
+    if isinstance(obj, (datetime.datetime, datetime.date, datetime.time)):
+        return obj.isoformat()
+    if isinstance(obj, enum.Enum):
+        return obj.value
+    return str(obj)
+
+
+if orjson is not None:
+    def dumps(obj: Any) -> bytes:
+        """Encode ``obj`` as compact JSON bytes."""
+        return orjson.dumps(obj, default=_default)
+
+    loads = orjson.loads
+else:
+    _encoder = json.JSONEncoder(default=_default, ensure_ascii=False, separators=(",", ":"))
+
+    def dumps(obj: Any) -> bytes:
+        """Encode ``obj`` as compact JSON bytes."""
+        return _encoder.encode(obj).encode("utf-8")
+
+    loads = json.loads
+
+
+def tool_serializer(obj: Any) -> str:
+    return dumps(obj).decode("utf-8")
+
+
+class EncodedToolResult(ToolResult):
+    """The tool result for ``obj``: its JSON text, and the same document as structured content."""
+
+    def __init__(self, obj: Any):
+        text = tool_serializer(obj)
+        super().__init__(content=[TextContent(type="text", text=text)])
+        # Parsed JSON is already JSON-compatible; ToolResult would walk it again
+        self.structured_content = loads(text)
@@ -0,0 +1,246 @@
+"""Bookkeeping for the SSE sessions opened through ``SseServerTransport``.
+
+The transport keeps a session's memory streams until the client closes the
+connection, and never forgets its session id, so agents that vanish without
+closing their socket pin memory forever. ``SessionRegistry`` wraps the
+transport's two entry points, tracks each session's last activity and the
+bytes queued in either direction, closes sessions that have been idle for
+``idle_timeout`` seconds, and refuses new sessions beyond ``max_sessions``.
+
+Messages the server writes go through a per-session queue of ``max_queue``
+messages. When a client reads too slowly to keep it drained, ``slow_reader``
+decides what happens: ``"block"`` makes the writing tool call wait,
+``"shed"`` also waits but answers the session's new POSTs with 503 until
+the queue has room, and ``"disconnect"`` closes the session.
+"""
+import re
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, Optional, Set
+from urllib.parse import parse_qs
+from uuid import UUID
+
+import anyio
+from anyio.streams.memory import MemoryObjectReceiveStream, MemoryObjectSendStream
+from mcp.server.sse import SseServerTransport
+from starlette.responses import Response
+from starlette.types import Message, Receive, Scope, Send
+
+_SESSION_ID_RE = re.compile(rb"session_id=([0-9a-fA-F]{32})")
+
+
+SLOW_READER_POLICIES = ("block", "shed", "disconnect")
+
+
+class SessionLimitError(Exception):
+    pass
+
+
+class StreamClosed(Response):
+    """Returned by an SSE endpoint whose response the transport has already sent."""
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        return None
+
+
+class _Session:
+    __slots__ = ("session_id", "created", "last_activity", "queued_bytes", "cancel_scope", "outbox",
+                 "blocked_seconds")
+
+    def __init__(self, now: float, cancel_scope: anyio.CancelScope):
+        self.session_id: Optional[str] = None
+        self.created = now
+        self.last_activity = now
+        self.queued_bytes = 0
+        self.cancel_scope = cancel_scope
+        self.outbox: Optional[MemoryObjectSendStream] = None
+        self.blocked_seconds = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        return self.outbox.statistics().current_buffer_used if self.outbox is not None else 0
+
+    @property
+    def queue_full(self) -> bool:
+        return self.outbox is not None and self.queue_depth >= self.outbox.statistics().max_buffer_size
+
+
+class _Outbox:
+    """The server's write stream for one session, applying the slow-reader policy when the queue is full."""
+
+    def __init__(self, registry: "SessionRegistry", session: _Session):
+        self._registry = registry
+        self._session = session
+
+    async def send(self, item) -> None:
+        stream = self._session.outbox
+        try:
+            return stream.send_nowait(item)
+        except anyio.WouldBlock:
+            pass
+        registry = self._registry
+        if registry.slow_reader == "disconnect":
+            registry.disconnected += 1
+            self._session.cancel_scope.cancel()
+        start = registry._clock()
+        try:
+            await stream.send(item)
+        finally:
+            elapsed = registry._clock() - start
+            self._session.blocked_seconds += elapsed
+            registry.blocked_seconds += elapsed
+
+    async def aclose(self) -> None:
+        await self._session.outbox.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+
+class SessionRegistry:
+    def __init__(self, transport: SseServerTransport, max_sessions: int = 1000,
+                 idle_timeout: float = 900.0, max_queue: int = 64, slow_reader: str = "block",
+                 clock=time.monotonic):
+        if slow_reader not in SLOW_READER_POLICIES:
+            raise ValueError(f"slow_reader must be one of {SLOW_READER_POLICIES}, not {slow_reader!r}")
+        self.transport = transport
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.max_queue = max_queue
+        self.slow_reader = slow_reader
+        self._clock = clock
+        self._sessions: Set[_Session] = set()
+        self._by_id: Dict[str, _Session] = {}
+        self.opened = 0
+        self.rejected = 0
+        self.evicted = 0
+        self.shed = 0
+        self.disconnected = 0
+        self.blocked_seconds = 0.0
+
+    @property
+    def live(self) -> int:
+        return len(self._sessions)
+
+    @asynccontextmanager
+    async def connect_sse(self, scope: Scope, receive: Receive, send: Send):
+        """``SseServerTransport.connect_sse`` plus tracking; raises SessionLimitError when full."""
+        if len(self._sessions) >= self.max_sessions:
+            self.rejected += 1
+            raise SessionLimitError(f"Session limit of {self.max_sessions} reached")
+
+        response_open = False
+
+        async def tracking_send(message: Message) -> None:
+            nonlocal response_open
+            if message["type"] == "http.response.start":
+                response_open = True
+            elif message["type"] == "http.response.body":
+                body = message.get("body", b"")
+                if session.session_id is None:
+                    match = _SESSION_ID_RE.search(body)
+                    if match:
+                        session.session_id = match.group(1).decode().lower()
+                        self._by_id[session.session_id] = session
+                elif b"event: message" in body:
+                    # Keep-alive pings do not count as activity
+                    session.last_activity = self._clock()
+                session.queued_bytes += len(body)
+                try:
+                    await send(message)
+                finally:
+                    session.queued_bytes -= len(body)
+                if not message.get("more_body", False):
+                    response_open = False
+                return
+            await send(message)
+
+        with anyio.CancelScope() as cancel_scope:
+            session = _Session(self._clock(), cancel_scope)
+            self._sessions.add(session)
+            self.opened += 1
+            try:
+                async with anyio.create_task_group() as tg:
+                    tg.start_soon(self._expire_when_idle, session)
+                    async with self.transport.connect_sse(scope, receive, tracking_send) as (read_stream,
+                                                                                             write_stream):
+                        session.outbox, outbox_reader = anyio.create_memory_object_stream(self.max_queue)
+                        tg.start_soon(self._pump, outbox_reader, write_stream)
+                        yield read_stream, _Outbox(self, session)
+                    tg.cancel_scope.cancel()
+            finally:
+                self._forget(session)
+        if cancel_scope.cancelled_caught and response_open:
+            # Evicted while the client is still connected: end the event stream cleanly
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+    @staticmethod
+    async def _pump(outbox_reader: MemoryObjectReceiveStream, write_stream: MemoryObjectSendStream) -> None:
+        async with outbox_reader, write_stream:
+            async for message in outbox_reader:
+                await write_stream.send(message)
+
+    async def handle_post_message(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """``SseServerTransport.handle_post_message`` plus activity and queued-bytes tracking."""
+        session_id = parse_qs(scope.get("query_string", b"").decode()).get("session_id", [""])[0]
+        session = self._by_id.get(session_id.lower())
+        if session is None:
+            return await self.transport.handle_post_message(scope, receive, send)
+        if self.slow_reader == "shed" and session.queue_full:
+            self.shed += 1
+            response = Response("Session is busy", status_code=503, headers={"Retry-After": "1"})
+            return await response(scope, receive, send)
+        size = int(dict(scope["headers"]).get(b"content-length", b"0") or 0)
+        session.last_activity = self._clock()
+        # The transport hands a message over only once the server reads it, so
+        # bytes stay queued here while the session is busy
+        session.queued_bytes += size
+        try:
+            await self.transport.handle_post_message(scope, receive, send)
+        finally:
+            session.queued_bytes -= size
+
+    def _forget(self, session: _Session) -> None:
+        self._sessions.discard(session)
+        if session.session_id is not None:
+            self._by_id.pop(session.session_id, None)
+            # The transport never drops closed sessions' writers on its own
+            self.transport._read_stream_writers.pop(UUID(hex=session.session_id), None)
+
+    async def _expire_when_idle(self, session: _Session) -> None:
+        while True:
+            idle = self._clock() - session.last_activity
+            if idle >= self.idle_timeout:
+                self.evicted += 1
+                session.cancel_scope.cancel()
+                return
+            await anyio.sleep(self.idle_timeout - idle)
+
+    def stats(self) -> Dict:
+        now = self._clock()
+        sessions = list(self._sessions)
+        return {
+            "live": len(sessions),
+            "max_sessions": self.max_sessions,
+            "opened": self.opened,
+            "rejected": self.rejected,
+            "evicted": self.evicted,
+            "slow_reader": self.slow_reader,
+            "shed": self.shed,
+            "disconnected": self.disconnected,
+            "blocked_seconds": round(self.blocked_seconds, 3),
+            "queued_bytes": sum(s.queued_bytes for s in sessions),
+            "queue_depth": sum(s.queue_depth for s in sessions),
+            "sessions": {
+                s.session_id: {
+                    "idle_seconds": round(now - s.last_activity, 1),
+                    "queued_bytes": s.queued_bytes,
+                    "queue_depth": s.queue_depth,
+                    "blocked_seconds": round(s.blocked_seconds, 3),
+                }
+                for s in sessions if s.session_id is not None
+            },
+        }
@@ -0,0 +1,38 @@
+"""Stateless streamable-HTTP endpoint for the demo servers.
+
+Every JSON-RPC request is a self-contained POST answered with a JSON body, so
+nothing ties a client to the process that served its previous request and
+tool calls can be load-balanced across workers. The SSE endpoints stay
+available for clients that need server-initiated messages.
+"""
+import contextlib
+from typing import Callable
+
+from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
+from starlette.requests import Request
+from starlette.types import Receive, Scope, Send
+
+
+class StreamableHTTPEndpoint:
+    """ASGI endpoint that authenticates each request and hands it to a stateless session manager.
+
+    ``authenticate`` receives the request and raises (e.g. ``HTTPException``)
+    to reject it. The session manager must be running, see ``lifespan``.
+    """
+
+    def __init__(self, server, authenticate: Callable[[Request], object], json_response: bool = True):
+        self.authenticate = authenticate
+        self.session_manager = StreamableHTTPSessionManager(
+            app=server,
+            stateless=True,
+            json_response=json_response,
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.authenticate(Request(scope))
+        await self.session_manager.handle_request(scope, receive, send)
+
+    @contextlib.asynccontextmanager
+    async def lifespan(self, app):
+        async with self.session_manager.run():
+            yield
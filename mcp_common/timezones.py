@@ -0,0 +1,91 @@
+"""City and timezone name lookup for TimeTool, built once at start-up.
+
+The LLM passes IANA names ("Asia/Kolkata") as often as plain city names
+("Bengaluru", "sao paulo"). ``TimezoneIndex`` maps every IANA zone, the
+city part of its name and a table of common aliases, normalized for case,
+accents and separators, to the zone's name in one dict; ``ZoneInfo``
+objects are cached per zone, so a lookup is a normalization and two dict
+hits.
+
+Aliases take precedence over IANA names: "EST" or "MST" as people use them
+means the region's civil time with daylight saving (America/New_York,
+America/Denver), not the fixed-offset IANA zones of that name, and link
+names such as "Calcutta" or "Japan" resolve to their canonical zone.
+"""
+import re
+import unicodedata
+from typing import Dict, Iterable, Optional
+from zoneinfo import ZoneInfo, available_timezones
+
+# Cities and names the LLM uses, mapped to the zone they mean. They override
+# IANA zone names and city parts with the same normalized name.
+ALIASES = {
+    "Asia/Kolkata": ["Bengaluru", "Bangalore", "Mumbai", "Bombay", "Delhi", "New Delhi", "Chennai", "Madras",
+                     "Hyderabad", "Pune", "Calcutta", "India", "IST"],
+    "Asia/Dubai": ["Abu Dhabi", "UAE", "United Arab Emirates"],
+    "Asia/Shanghai": ["Beijing", "Shenzhen", "Guangzhou", "China"],
+    "Asia/Tokyo": ["Osaka", "Kyoto", "Japan", "JST"],
+    "Asia/Singapore": ["Singapore"],
+    "Europe/London": ["Manchester", "Edinburgh", "UK", "United Kingdom", "England"],
+    "Europe/Berlin": ["Munich", "Frankfurt", "Hamburg", "Germany"],
+    "Europe/Paris": ["France", "Lyon"],
+    "Europe/Zurich": ["Geneva", "Switzerland"],
+    "America/New_York": ["New York City", "NYC", "Washington", "Washington DC", "Boston", "Miami", "Atlanta",
+                         "EST", "EDT", "Eastern"],
+    "America/Chicago": ["Dallas", "Houston", "Austin", "CST", "CDT", "Central"],
+    "America/Denver": ["MST", "MDT", "Mountain"],
+    "America/Los_Angeles": ["San Francisco", "Seattle", "LA", "San Jose", "Silicon Valley", "PST", "PDT", "Pacific"],
+    "America/Toronto": ["Ottawa", "Montreal"],
+    "America/Sao_Paulo": ["Rio de Janeiro", "Brazil"],
+    "Australia/Sydney": ["Canberra"],
+    "UTC": ["GMT", "Zulu", "Coordinated Universal Time"],
+}
+
+
+def normalize_zone_name(name: str) -> str:
+    """Fold case and accents, and treat ``_``, ``-`` and runs of spaces alike."""
+    decomposed = unicodedata.normalize("NFKD", name)
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return re.sub(r"[\s_\-]+", " ", stripped.casefold()).strip()
+
+
+class UnknownTimezone(ValueError):
+    pass
+
+
+class TimezoneIndex:
+    """Resolves IANA zone names, their city part and aliases to cached ``ZoneInfo`` objects."""
+
+    def __init__(self, zones: Optional[Iterable[str]] = None, aliases: Dict[str, list] = ALIASES):
+        zones = available_timezones() if zones is None else set(zones)
+        self._names: Dict[str, str] = {}
+        self._zones: Dict[str, ZoneInfo] = {}
+        # Full names win over city parts and shallower names over deeper ones,
+        # e.g. "Indianapolis" is America/Indianapolis, not America/Indiana/Indianapolis
+        ordered = sorted(zones, key=lambda zone: (zone.count("/"), zone))
+        for zone in ordered:
+            self._names[normalize_zone_name(zone)] = zone
+        for zone in ordered:
+            if "/" in zone and not zone.startswith("Etc/"):
+                self._names.setdefault(normalize_zone_name(zone.rsplit("/", 1)[1]), zone)
+        for zone, names in aliases.items():
+            if zone in zones:
+                for name in names:
+                    self._names[normalize_zone_name(name)] = zone
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def zone_name(self, name: str) -> str:
+        """The IANA name for ``name``, or ``UnknownTimezone``."""
+        zone = self._names.get(normalize_zone_name(name))
+        if zone is None:
+            raise UnknownTimezone(f"Unknown timezone or city: {name}")
+        return zone
+
+    def resolve(self, name: str) -> ZoneInfo:
+        zone = self.zone_name(name)
+        info = self._zones.get(zone)
+        if info is None:
+            info = self._zones[zone] = ZoneInfo(zone)
+        return info
@@ -0,0 +1,93 @@
+"""Bounded LRU cache of JWTs that have already passed signature verification."""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+
+class VerifiedTokenCache:
+    """Remembers the claims of verified tokens until they expire.
+
+    Entries are keyed by a digest of the raw token, so the cache never holds
+    bearer credentials in memory. An entry is served until the token's ``exp``
+    claim and the whole cache is dropped whenever the verification key changes.
+    """
+
+    def __init__(self, max_entries: int = 10_000, clock=time.time):
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: "OrderedDict[bytes, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._key_fingerprint: Optional[bytes] = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def bind_key(self, key) -> None:
+        """Associate the cache with a verification key, clearing it on rotation."""
+        if isinstance(key, str):
+            key = key.encode()
+        fingerprint = hashlib.sha256(key).digest()
+        with self._lock:
+            if fingerprint != self._key_fingerprint:
+                self._entries.clear()
+                self._key_fingerprint = fingerprint
+
+    def get(self, token: str) -> Optional[Dict]:
+        """Return the cached claims for ``token`` or ``None`` on a miss."""
+        digest = self.digest(token)
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None:
+                self.misses += 1
+                return None
+            exp, claims = entry
+            if exp <= self._clock():
+                del self._entries[digest]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(digest)
+            self.hits += 1
+            return claims
+
+    def peek(self, token: str) -> Optional[Dict]:
+        """``get`` without counting a hit or miss or refreshing the entry's recency."""
+        with self._lock:
+            entry = self._entries.get(self.digest(token))
+        if entry is None or entry[0] <= self._clock():
+            return None
+        return entry[1]
+
+    def put(self, token: str, claims: Dict) -> None:
+        """Cache the claims of a token that was just verified."""
+        exp = claims.get("exp")
+        # Tokens without an expiry are never cached: there is no safe point to drop them.
+        if not isinstance(exp, (int, float)) or self.max_entries <= 0:
+            return
+        digest = self.digest(token)
+        with self._lock:
+            self._entries[digest] = (exp, claims)
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,88 @@
+"""JWT minting for the /token endpoints, with an optional process pool for large batches."""
+import os
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+import jwt
+
+# More signing processes than this only add start-up and hand-off cost
+MAX_DEFAULT_WORKERS = 4
+
+
+def _sign_chunk(payloads: List[Dict], secret: str, algorithm: str) -> List[str]:
+    # Parse the key once per chunk: loading a PEM private key costs more than signing with it
+    key = jwt.get_algorithm_by_name(algorithm).prepare_key(secret)
+    return [jwt.encode(payload, key, algorithm=algorithm) for payload in payloads]
+
+
+def default_workers(algorithm: str, server_processes: int = 1) -> int:
+    """Signing processes to use when none are configured.
+
+    An HMAC signature takes microseconds and a pool did not beat signing
+    HS* tokens in-process (benchmarks/bench_token_issuance.py), so they are
+    signed in-process. Asymmetric
+    algorithms share the CPUs with the other ``server_processes``, up to
+    ``MAX_DEFAULT_WORKERS``.
+    """
+    if algorithm.startswith("HS"):
+        return 1
+    return max(1, min(MAX_DEFAULT_WORKERS, (os.cpu_count() or 1) // max(1, server_processes)))
+
+
+class TokenIssuer:
+    """Signs access tokens one at a time or in batches.
+
+    With ``workers`` > 1, ``start`` creates a ``ProcessPoolExecutor`` and
+    batches larger than ``chunk_size`` are split into chunks signed in it, so
+    signing is not serialised behind the GIL. Until ``start`` (and after
+    ``shutdown``) every batch is signed in-process.
+    """
+
+    def __init__(self, secret: str, algorithm: str = "HS256", lifetime_seconds: int = 3600,
+                 workers: Optional[int] = None, chunk_size: int = 256):
+        self.secret = secret
+        self.algorithm = algorithm
+        self.lifetime_seconds = lifetime_seconds
+        self.workers = workers or default_workers(algorithm)
+        self.chunk_size = chunk_size
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def start(self) -> "TokenIssuer":
+        """Start the signing pool, from the main thread at start-up (e.g. an app's lifespan).
+
+        The pool's processes are forked here, not from whichever request
+        thread first needs them.
+        """
+        if self.workers > 1 and self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+            # The first task forks every worker
+            self._pool.submit(_sign_chunk, [], self.secret, self.algorithm).result()
+        return self
+
+    def payload(self, client_id: str, now: Optional[float] = None) -> Dict:
+        now = time.time() if now is None else now
+        return {"sub": client_id, "exp": int(now) + self.lifetime_seconds, "jti": uuid.uuid4().hex}
+
+    def issue(self, client_id: str) -> str:
+        return jwt.encode(self.payload(client_id), self.secret, algorithm=self.algorithm)
+
+    def issue_many(self, client_ids: List[str]) -> List[str]:
+        """Sign one token per entry of ``client_ids``, preserving order."""
+        now = time.time()
+        payloads = [self.payload(client_id, now) for client_id in client_ids]
+        pool = self._pool
+        if pool is None or len(payloads) <= self.chunk_size:
+            return _sign_chunk(payloads, self.secret, self.algorithm)
+        chunks = [payloads[i:i + self.chunk_size] for i in range(0, len(payloads), self.chunk_size)]
+        futures = [pool.submit(_sign_chunk, chunk, self.secret, self.algorithm) for chunk in chunks]
+        tokens = []
+        for future in futures:
+            tokens.extend(future.result())
+        return tokens
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
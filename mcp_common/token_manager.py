@@ -0,0 +1,87 @@
+"""Client-side access-token cache for the JWT demo."""
+import asyncio
+import base64
+import json
+import time
+from typing import Optional
+
+import aiohttp
+from loguru import logger
+
+
+def token_expiry(token: str) -> float:
+    """Read the ``exp`` claim of a JWT without verifying it (the server does that)."""
+    payload = token.split(".")[1]
+    payload += "=" * (-len(payload) % 4)
+    return float(json.loads(base64.urlsafe_b64decode(payload))["exp"])
+
+
+class TokenManager:
+    """Fetches tokens from ``/token`` over one pooled HTTP session and caches them.
+
+    Once a token is within ``refresh_margin`` seconds of its expiry a refresh is
+    started in the background while callers keep using the current token. Only
+    when the token is within ``min_validity`` seconds of expiring do callers wait,
+    and every concurrent caller awaits the same in-flight request.
+    """
+
+    def __init__(self, token_url: str, client_id: str, client_secret: str,
+                 refresh_margin: float = 60.0, min_validity: float = 5.0):
+        self.token_url = token_url
+        self.credentials = {"client_id": client_id, "client_secret": client_secret}
+        self.refresh_margin = refresh_margin
+        self.min_validity = min_validity
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._token: Optional[str] = None
+        self._expires_at = 0.0
+        self._inflight: Optional[asyncio.Task] = None
+        self.fetches = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=10, keepalive_timeout=60))
+        return self._session
+
+    async def get_token(self) -> str:
+        remaining = self._expires_at - time.time()
+        if self._token is not None and remaining > self.min_validity:
+            if remaining <= self.refresh_margin:
+                self._refresh()
+            return self._token
+        return await asyncio.shield(self._refresh())
+
+    def _refresh(self) -> asyncio.Task:
+        if self._inflight is None or self._inflight.done():
+            self._inflight = asyncio.ensure_future(self._fetch())
+            self._inflight.add_done_callback(self._log_failure)
+        return self._inflight
+
+    @staticmethod
+    def _log_failure(task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"Token refresh failed: {task.exception()}")
+
+    async def _fetch(self) -> str:
+        async with self.session.post(self.token_url, json=self.credentials) as resp:
+            if resp.status != 200:
+                logger.error(f"Failed to get token: {resp.status}")
+                raise Exception("Unable to authenticate. Ensure you are using valid credentials")
+            data = await resp.json()
+        token = data["access_token"]
+        self._token, self._expires_at = token, token_expiry(token)
+        self.fetches += 1
+        logger.info("Successfully generated token")
+        return token
+
+    async def close(self) -> None:
+        if self._inflight is not None and not self._inflight.done():
+            self._inflight.cancel()
+        if self._session is not None:
+            await self._session.close()
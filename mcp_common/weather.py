@@ -0,0 +1,234 @@
+"""Async OpenWeatherMap client with a shared connection pool, a TTL cache and request coalescing.
+
+``weather_tool`` used to call ``requests.get`` from a sync tool, which
+FastMCP runs on the event loop: every lookup opened a new connection and
+a slow upstream stalled all sessions of the worker. ``WeatherClient``
+keeps one pooled ``httpx.AsyncClient`` with timeouts, serves a city from
+cache for ``ttl`` seconds, and lets concurrent lookups of the same city
+share one upstream request. ``current_many`` looks up many cities at once,
+fetching those whose city id is already known in group requests.
+
+OPENWEATHERMAP_URL points it elsewhere, e.g. at
+``benchmarks/mock_weather_server.py`` for offline runs.
+"""
+import asyncio
+import os
+import time
+from typing import Dict, Iterable, List, Optional
+
+import httpx
+
+OPENWEATHERMAP_URL = os.getenv("OPENWEATHERMAP_URL", "http://api.openweathermap.org/data/2.5")
+# OpenWeatherMap's limit of city ids per group request
+GROUP_SIZE = 20
+
+
+def normalize_location(location: str) -> str:
+    return " ".join(location.split()).casefold()
+
+
+class WeatherClient:
+    """Current-weather lookups by city name.
+
+    ``current`` returns OpenWeatherMap's JSON for the city, or None when
+    the upstream does not know it; transport errors and timeouts raise
+    ``httpx.HTTPError``. Only successful lookups are cached.
+
+    The group endpoint takes city ids, not names, so ``current_many`` can
+    only batch cities looked up before; the ids are kept after their
+    weather expires. New cities are fetched one by one.
+    """
+
+    def __init__(self, api_key: Optional[str] = None, base_url: str = OPENWEATHERMAP_URL, ttl: float = 600.0,
+                 timeout: float = 5.0, max_connections: int = 32, max_entries: int = 10_000,
+                 clock=time.monotonic):
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+        self.ttl = ttl
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.max_entries = max_entries
+        self._clock = clock
+        self._http: Optional[httpx.AsyncClient] = None
+        self._cache: Dict[str, tuple] = {}
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._city_ids: Dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.upstream_requests = 0
+        self.upstream_errors = 0
+        self.group_requests = 0
+
+    def _client(self) -> httpx.AsyncClient:
+        # Created on first use so it belongs to the event loop serving requests
+        if self._http is None:
+            self._http = httpx.AsyncClient(
+                timeout=httpx.Timeout(self.timeout),
+                limits=httpx.Limits(max_connections=self.max_connections,
+                                    max_keepalive_connections=self.max_connections),
+            )
+        return self._http
+
+    def _cached(self, key: str):
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        expires, data = entry
+        if expires <= self._clock():
+            del self._cache[key]
+            return None
+        return data
+
+    def _store(self, key: str, data: Dict) -> None:
+        if len(self._cache) >= self.max_entries:
+            now = self._clock()
+            for stale in [k for k, (expires, _) in self._cache.items() if expires <= now]:
+                del self._cache[stale]
+            if len(self._cache) >= self.max_entries:
+                # Still full of live entries: drop the oldest inserted
+                del self._cache[next(iter(self._cache))]
+        self._cache[key] = (self._clock() + self.ttl, data)
+        if "id" in data and (key in self._city_ids or len(self._city_ids) < self.max_entries):
+            self._city_ids[key] = data["id"]
+
+    async def current(self, location: str) -> Optional[Dict]:
+        key = normalize_location(location)
+        data = self._cached(key)
+        if data is not None:
+            self.hits += 1
+            return data
+        self.misses += 1
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_and_store(key, location))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._fetch_done(key, done))
+        else:
+            self.coalesced += 1
+        # shield: a caller giving up must not cancel the lookup for the others
+        return await asyncio.shield(task)
+
+    def _fetch_done(self, key: str, task: asyncio.Task) -> None:
+        del self._inflight[key]
+        # Retrieve the error so one no caller waited for is not reported as unhandled
+        if not task.cancelled():
+            task.exception()
+
+    async def _fetch_and_store(self, key: str, location: str) -> Optional[Dict]:
+        data = await self._fetch(location)
+        if data is not None:
+            self._store(key, data)
+        return data
+
+    async def current_many(self, locations: Iterable[str], concurrency: int = 8) -> Dict[str, object]:
+        """Look up several cities with at most ``concurrency`` upstream requests in flight.
+
+        Returns a dict from each distinct location to its weather JSON, None
+        if the city is unknown, or the exception that lookup raised, so one
+        failing city does not fail the others.
+        """
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        lookups: Dict[str, str] = {}
+        # The first spelling of each city is the one sent upstream
+        names: Dict[str, str] = {}
+        for location in locations:
+            key = lookups.setdefault(location, normalize_location(location))
+            names.setdefault(key, location)
+
+        by_key: Dict[str, object] = {}
+        pending: Dict[str, asyncio.Future] = {}
+        groupable: List[str] = []
+        for key, location in names.items():
+            data = self._cached(key)
+            if data is not None:
+                self.hits += 1
+                by_key[key] = data
+            elif key in self._inflight:
+                self.misses += 1
+                self.coalesced += 1
+                pending[key] = self._inflight[key]
+            elif key in self._city_ids:
+                self.misses += 1
+                groupable.append(key)
+            else:
+                pending[key] = asyncio.ensure_future(self._bounded(semaphore, self.current(location)))
+
+        for start in range(0, len(groupable), GROUP_SIZE):
+            chunk = groupable[start:start + GROUP_SIZE]
+            group = asyncio.ensure_future(self._bounded(semaphore, self._fetch_group(chunk)))
+            for key in chunk:
+                task = asyncio.ensure_future(self._from_group(group, key, names[key]))
+                self._inflight[key] = task
+                task.add_done_callback(lambda done, key=key: self._fetch_done(key, done))
+                pending[key] = task
+
+        keys = list(pending)
+        outcomes = await asyncio.gather(*(asyncio.shield(pending[key]) for key in keys), return_exceptions=True)
+        by_key.update(zip(keys, outcomes))
+        return {location: by_key[key] for location, key in lookups.items()}
+
+    @staticmethod
+    async def _bounded(semaphore: asyncio.Semaphore, coro):
+        async with semaphore:
+            return await coro
+
+    async def _from_group(self, group: asyncio.Future, key: str, location: str) -> Optional[Dict]:
+        data = (await asyncio.shield(group)).get(key)
+        if data is None:
+            # The id is stale or the group request skipped it: ask by name
+            data = await self._fetch_and_store(key, location)
+        return data
+
+    async def _fetch_group(self, keys: List[str]) -> Dict[str, Dict]:
+        ids = {self._city_ids[key]: key for key in keys}
+        self.upstream_requests += 1
+        self.group_requests += 1
+        try:
+            response = await self._client().get(
+                f"{self.base_url}/group",
+                params={"id": ",".join(str(city_id) for city_id in ids), "appid": self.api_key, "units": "metric"})
+            response.raise_for_status()
+        except httpx.HTTPError:
+            self.upstream_errors += 1
+            raise
+        found = {}
+        for data in response.json().get("list", []):
+            key = ids.get(data.get("id"))
+            if key is not None:
+                self._store(key, data)
+                found[key] = data
+        return found
+
+    async def _fetch(self, location: str) -> Optional[Dict]:
+        self.upstream_requests += 1
+        try:
+            response = await self._client().get(
+                f"{self.base_url}/weather", params={"q": location, "appid": self.api_key, "units": "metric"})
+        except httpx.HTTPError:
+            self.upstream_errors += 1
+            raise
+        if response.status_code != 200:
+            if response.status_code != 404:
+                self.upstream_errors += 1
+            return None
+        return response.json()
+
+    async def aclose(self) -> None:
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "cached": len(self._cache),
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "upstream_requests": self.upstream_requests,
+            "upstream_errors": self.upstream_errors,
+            "group_requests": self.group_requests,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
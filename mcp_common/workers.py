@@ -0,0 +1,218 @@
+"""Serve an SSE app from several worker processes with session affinity.
+
+An SSE session lives in the memory of the worker that accepted its ``/sse``
+GET, but the kernel hands the matching ``/messages/`` POSTs to whichever
+worker accepts the connection. Every worker therefore also listens on a Unix
+socket in a shared run directory, and records each session it opens as a
+symlink ``<run_dir>/sessions/<session id> -> <its socket>``. A POST for a
+session owned by another worker is forwarded to the owner over its socket,
+so the lookup is a single ``readlink`` and no external broker is needed.
+
+    run_workers(app, host="0.0.0.0", port=8100, workers=4)
+"""
+import asyncio
+import multiprocessing
+import os
+import re
+import shutil
+import signal
+import socket
+import tempfile
+from typing import Dict, Optional
+from urllib.parse import parse_qs
+
+import httpx
+import uvicorn
+from loguru import logger
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+_SESSION_ID_RE = re.compile(rb"session_id=([0-9a-fA-F]{32})")
+
+# Set on forwarded requests so the owner never forwards them again
+FORWARDED_HEADER = b"x-mcp-forwarded-by"
+
+# Response headers not copied from the owner's reply: hop-by-hop headers,
+# those describing the body as sent (httpx has already decoded it, and the
+# length is set again), and the ones uvicorn adds itself
+_UNFORWARDED_HEADERS = frozenset({
+    b"connection", b"keep-alive", b"proxy-authenticate", b"proxy-authorization", b"te", b"trailer",
+    b"transfer-encoding", b"upgrade", b"content-length", b"content-encoding", b"date", b"server",
+})
+
+
+class SessionAffinityMiddleware:
+    """Registers SSE sessions opened by this worker and forwards POSTs for other workers' sessions."""
+
+    def __init__(self, app: ASGIApp, run_dir: str, worker_id: int,
+                 sse_path: str = "/sse", message_path: str = "/messages/"):
+        self.app = app
+        self.worker_id = worker_id
+        self.sessions_dir = os.path.join(run_dir, "sessions")
+        self.socket_path = worker_socket_path(run_dir, worker_id)
+        self.sse_path = sse_path
+        self.message_path = message_path
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self.forwarded = 0
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            if scope["path"] == self.sse_path and scope["method"] == "GET":
+                return await self._serve_sse(scope, receive, send)
+            if scope["path"] == self.message_path and scope["method"] == "POST":
+                owner = self._owner(scope)
+                if owner is not None:
+                    return await self._forward(owner, scope, receive, send)
+        await self.app(scope, receive, send)
+
+    async def _serve_sse(self, scope: Scope, receive: Receive, send: Send) -> None:
+        session_id = None
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal session_id
+            if session_id is None and message["type"] == "http.response.body":
+                match = _SESSION_ID_RE.search(message.get("body", b""))
+                if match:
+                    session_id = match.group(1).decode().lower()
+                    os.symlink(self.socket_path, os.path.join(self.sessions_dir, session_id))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if session_id is not None:
+                try:
+                    os.unlink(os.path.join(self.sessions_dir, session_id))
+                except FileNotFoundError:
+                    pass
+
+    def _owner(self, scope: Scope) -> Optional[str]:
+        """Socket of the worker owning the POST's session, or None to handle it here."""
+        if any(name == FORWARDED_HEADER for name, _ in scope["headers"]):
+            return None
+        session_id = parse_qs(scope.get("query_string", b"").decode()).get("session_id", [""])[0]
+        if not _SESSION_ID_RE.fullmatch(b"session_id=" + session_id.encode()):
+            return None
+        try:
+            owner = os.readlink(os.path.join(self.sessions_dir, session_id.lower()))
+        except OSError:
+            return None
+        return None if owner == self.socket_path else owner
+
+    def _client(self, socket_path: str) -> httpx.AsyncClient:
+        client = self._clients.get(socket_path)
+        if client is None:
+            client = self._clients[socket_path] = httpx.AsyncClient(
+                transport=httpx.AsyncHTTPTransport(uds=socket_path),
+                base_url="http://worker",
+            )
+        return client
+
+    async def _forward(self, owner: str, scope: Scope, receive: Receive, send: Send) -> None:
+        body = b""
+        more_body = True
+        while more_body:
+            message = await receive()
+            body += message.get("body", b"")
+            more_body = message.get("more_body", False)
+        headers = [(name, value) for name, value in scope["headers"] if name not in (b"host", b"content-length")]
+        headers.append((FORWARDED_HEADER, str(self.worker_id).encode()))
+        target = scope["path"] + ("?" + scope["query_string"].decode() if scope.get("query_string") else "")
+        try:
+            upstream = await self._client(owner).request(scope["method"], target, headers=headers, content=body)
+        except httpx.TransportError as e:
+            # The owning worker is gone, and so is the session
+            logger.warning(f"Worker {self.worker_id} could not reach session owner {owner}: {e}")
+            response = Response("Could not find session", status_code=404)
+        else:
+            self.forwarded += 1
+            # The owner's headers, such as Retry-After on a 429 or 503, reach the client
+            response = Response(upstream.content, status_code=upstream.status_code)
+            response.raw_headers.extend((name.lower(), value) for name, value in upstream.headers.raw
+                                        if name.lower() not in _UNFORWARDED_HEADERS)
+        await response(scope, receive, send)
+
+
+def worker_socket_path(run_dir: str, worker_id: int) -> str:
+    return os.path.join(run_dir, f"worker-{worker_id}.sock")
+
+
+def _serve_worker(app, listener: socket.socket, run_dir: str, worker_id: int) -> None:
+    app.add_middleware(SessionAffinityMiddleware, run_dir=run_dir, worker_id=worker_id)
+    local = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    local.bind(worker_socket_path(run_dir, worker_id))
+    server = uvicorn.Server(uvicorn.Config(app, log_level="info", timeout_graceful_shutdown=5))
+    logger.info(f"Worker {worker_id} (pid {os.getpid()}) serving, forwarding socket {local.getsockname()}")
+    # Ctrl-C reaches the whole process group, and the parent stops the workers
+    # with SIGTERM. uvicorn restores this handler when it has shut down and then
+    # re-raises the signals it caught; ignored, a SIGINT no longer ends the
+    # worker with a KeyboardInterrupt traceback from asyncio.run.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    asyncio.run(server.serve(sockets=[listener, local]))
+
+
+def _drop_sessions(run_dir: str, worker_id: int) -> None:
+    owner = worker_socket_path(run_dir, worker_id)
+    sessions_dir = os.path.join(run_dir, "sessions")
+    for name in os.listdir(sessions_dir):
+        link = os.path.join(sessions_dir, name)
+        try:
+            if os.readlink(link) == owner:
+                os.unlink(link)
+        except OSError:
+            pass
+
+
+def run_workers(app, host: str = "0.0.0.0", port: int = 8100, workers: int = 2,
+                run_dir: Optional[str] = None) -> None:
+    """Serve ``app`` from ``workers`` forked processes sharing one listening socket.
+
+    Workers that die are restarted; their SSE sessions are lost and clients
+    reconnect as they would after a server restart.
+    """
+    own_run_dir = run_dir is None
+    run_dir = run_dir or tempfile.mkdtemp(prefix="mcp-workers-")
+    os.makedirs(os.path.join(run_dir, "sessions"), exist_ok=True)
+
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    listener.bind((host, port))
+    listener.listen(2048)
+    listener.set_inheritable(True)
+
+    context = multiprocessing.get_context("fork")
+
+    def spawn(worker_id: int):
+        path = worker_socket_path(run_dir, worker_id)
+        if os.path.exists(path):
+            os.unlink(path)
+        process = context.Process(target=_serve_worker, args=(app, listener, run_dir, worker_id))
+        process.start()
+        return process
+
+    processes = {worker_id: spawn(worker_id) for worker_id in range(workers)}
+    logger.info(f"Serving on http://{host}:{port} with {workers} workers (run dir {run_dir})")
+    stopping = False
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    try:
+        while not stopping:
+            for worker_id, process in list(processes.items()):
+                process.join(timeout=0.5 / workers)
+                if not process.is_alive() and not stopping:
+                    logger.warning(f"Worker {worker_id} exited with {process.exitcode}, restarting")
+                    _drop_sessions(run_dir, worker_id)
+                    processes[worker_id] = spawn(worker_id)
+    finally:
+        for process in processes.values():
+            process.terminate()
+        for process in processes.values():
+            process.join()
+        listener.close()
+        if own_run_dir:
+            shutil.rmtree(run_dir, ignore_errors=True)
@@ -0,0 +1,73 @@
+"""A token revoked through one worker of the JWT server is rejected by the others.
+
+Starts the server with two workers on a free port and talks to each worker
+directly over its forwarding socket in the run directory.
+"""
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SERVER_DIR = os.path.join(ROOT, "JWT-Based-Authentication")
+sys.path.append(ROOT)
+
+from mcp_common.workers import worker_socket_path
+
+CREDENTIALS = {"client_id": "test_client", "client_secret": "secret_1234"}
+INITIALIZE = {"jsonrpc": "2.0", "id": 1, "method": "initialize",
+              "params": {"protocolVersion": "2025-03-26", "capabilities": {},
+                         "clientInfo": {"name": "test", "version": "1"}}}
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def worker_client(run_dir, worker_id):
+    return httpx.Client(transport=httpx.HTTPTransport(uds=worker_socket_path(run_dir, worker_id)),
+                        base_url="http://worker", timeout=10)
+
+
+def mcp_status(client, token):
+    response = client.post("/mcp", json=INITIALIZE, headers={"authorization": f"Bearer {token}",
+                                                             "accept": "application/json, text/event-stream"})
+    return response.status_code
+
+
+def test_revocation_reaches_other_workers():
+    with tempfile.TemporaryDirectory() as tmp:
+        run_dir = os.path.join(tmp, "run")
+        env = dict(os.environ, REVOCATION_FILE=os.path.join(tmp, "revoked.txt"))
+        code = (f"import server; from mcp_common.workers import run_workers; "
+                f"run_workers(server.app, host='127.0.0.1', port={free_port()}, workers=2, run_dir={run_dir!r})")
+        process = subprocess.Popen([sys.executable, "-c", code], cwd=SERVER_DIR, env=env,
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            deadline = time.monotonic() + 30
+            while not all(os.path.exists(worker_socket_path(run_dir, i)) for i in (0, 1)):
+                assert process.poll() is None and time.monotonic() < deadline, "workers did not start"
+                time.sleep(0.1)
+            time.sleep(0.5)
+            with worker_client(run_dir, 0) as first, worker_client(run_dir, 1) as second:
+                token = first.post("/token", json=CREDENTIALS).json()["access_token"]
+                assert mcp_status(second, token) == 200
+
+                response = first.post("/token/revoke", json={**CREDENTIALS, "token": token})
+                assert response.json() == {"revoked": True}
+
+                # The other worker re-reads the file at most once a second
+                deadline = time.monotonic() + 5
+                while mcp_status(second, token) != 401:
+                    assert time.monotonic() < deadline, "revoked token still accepted by the other worker"
+                    time.sleep(0.2)
+                assert mcp_status(first, token) == 401
+        finally:
+            process.terminate()
+            process.wait(timeout=15)